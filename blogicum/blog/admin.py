@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from blog.models import Post, Category, Location
+from blog.models import Post, Category, Location, OutboxEmail
+from blog.search import search_posts
 
 
 admin.site.empty_value_display = "Не задано"
@@ -27,6 +28,8 @@ class PostAdmin(admin.ModelAdmin):
         "location",
         "category",
         "is_published",
+        "comment_count",
+        "views",
     )
 
     list_editable = (
@@ -37,5 +40,23 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ("is_published",)
     list_display_links = ("title",)
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search_posts(queryset, search_term), False
+
 
 admin.site.register(Location)
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        "subject",
+        "created_at",
+        "attempts",
+        "next_attempt_at",
+        "sent_at",
+    )
+    list_filter = ("sent_at",)
+    readonly_fields = ("created_at", "last_error")
@@ -1,4 +1,6 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
 
 
 class BlogConfig(AppConfig):
@@ -6,3 +8,11 @@ class BlogConfig(AppConfig):
     name = "blog"
 
     verbose_name = "Блог"
+
+    def ready(self):
+        from blog import signals  # noqa: F401
+        from blog.search import install_search_triggers
+        from blog.sqlite import configure_sqlite_connection
+
+        post_migrate.connect(install_search_triggers, sender=self)
+        connection_created.connect(configure_sqlite_connection)
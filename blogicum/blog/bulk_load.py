@@ -0,0 +1,178 @@
+import json
+from collections import Counter
+from contextlib import contextmanager
+
+from django.core.management.color import no_style
+from django.core.serializers.python import Deserializer
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from blog.cache_tags import FEED, GLOBAL, bump_tag
+from blog.counters import recount_comments
+from blog.paginators import CachedCountPaginator
+
+
+LOADABLE_MODELS = (
+    "auth.user",
+    "blog.category",
+    "blog.location",
+    "blog.post",
+    "blog.comment",
+)
+
+_decoder = json.JSONDecoder()
+
+
+def iter_json_array(fh, chunk_size=1 << 16):
+    """Отдаёт элементы JSON-массива по одному, не читая файл целиком."""
+    buffer = ""
+    position = 0
+    started = False
+    eof = False
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if not started and position < len(buffer):
+            if buffer[position] != "[":
+                raise ValueError("Ожидался JSON-массив объектов.")
+            started = True
+            position += 1
+            continue
+        if position < len(buffer) and buffer[position] == "]":
+            return
+        try:
+            obj, end = _decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                if buffer[position:].strip():
+                    raise
+                return
+            chunk = fh.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield obj
+        position = end
+
+
+def iter_json_lines(fh):
+    for line in fh:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_fixture(fh, fmt=None):
+    """JSON-массив dumpdata или JSON Lines (по одному объекту в строке)."""
+    if fmt is None:
+        name = getattr(fh, "name", "")
+        fmt = "jsonl" if name.endswith((".jsonl", ".ndjson")) else "json"
+    if fmt == "jsonl":
+        return iter_json_lines(fh)
+    return iter_json_array(fh)
+
+
+class BulkLoader:
+    """Загружает поток объектов фикстуры пачками через bulk_create.
+
+    Каждая пачка — одна модель и одна транзакция. Сигналы моделей при
+    этом не срабатывают, поэтому после загрузки вызывающий код должен
+    сам пересчитать денормализованные поля.
+    """
+
+    def __init__(self, batch_size=1000, using=DEFAULT_DB_ALIAS):
+        self.batch_size = batch_size
+        self.using = using
+        self.loaded = Counter()
+        self.skipped = Counter()
+        self.models = []
+        self._batch = []
+
+    def load(self, objects):
+        """Как и loaddata, проверяет внешние ключи один раз в конце.
+
+        Дамп может ссылаться на объекты, которые идут в нём позже, а каждая
+        пачка фиксируется отдельно.
+        """
+        connection = connections[self.using]
+        wanted = (
+            obj for obj in objects if self._is_loadable(obj.get("model", ""))
+        )
+        with connection.constraint_checks_disabled():
+            for deserialized in Deserializer(
+                wanted, using=self.using, ignorenonexistent=True
+            ):
+                model = type(deserialized.object)
+                if self._batch and type(self._batch[0].object) is not model:
+                    self._flush()
+                self._batch.append(deserialized)
+                if len(self._batch) >= self.batch_size:
+                    self._flush()
+            self._flush()
+        connection.check_constraints(
+            table_names=[model._meta.db_table for model in self.models]
+        )
+        self._reset_sequences()
+        return self.loaded
+
+    def _is_loadable(self, label):
+        if label.lower() in LOADABLE_MODELS:
+            return True
+        self.skipped[label] += 1
+        return False
+
+    def _flush(self):
+        if not self._batch:
+            return
+        model = type(self._batch[0].object)
+        with transaction.atomic(using=self.using):
+            model.objects.using(self.using).bulk_create(
+                [item.object for item in self._batch]
+            )
+            for item in self._batch:
+                for field_name, values in (item.m2m_data or {}).items():
+                    if values:
+                        getattr(item.object, field_name).set(values)
+        if model not in self.models:
+            self.models.append(model)
+        self.loaded[model._meta.label] += len(self._batch)
+        self._batch = []
+
+    def _reset_sequences(self):
+        connection = connections[self.using]
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), self.models
+        )
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+
+@contextmanager
+def deferred_indexes(models, using=DEFAULT_DB_ALIAS):
+    """Удаляет Meta.indexes моделей на время загрузки и создаёт заново.
+
+    Один проход построения индекса по готовой таблице дешевле, чем
+    обновление индекса на каждой вставке.
+    """
+    indexes = [
+        (model, index) for model in models for index in model._meta.indexes
+    ]
+    with connections[using].schema_editor() as editor:
+        for model, index in indexes:
+            editor.remove_index(model, index)
+    try:
+        yield
+    finally:
+        with connections[using].schema_editor() as editor:
+            for model, index in indexes:
+                editor.add_index(model, index)
+
+
+def refresh_after_bulk_insert(recount=True):
+    """Досчитывает то, что при bulk_create не делают сигналы моделей."""
+    if recount:
+        with transaction.atomic():
+            recount_comments()
+    for tag in (GLOBAL, FEED, CachedCountPaginator.COUNT_TAG):
+        bump_tag(tag)
@@ -0,0 +1,41 @@
+import os
+import tempfile
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.filebased import (
+    FileBasedCache as DjangoFileBasedCache,
+)
+
+
+class FileBasedCache(DjangoFileBasedCache):
+    """Файловый кэш с атомарным add().
+
+    В Django add() сначала проверяет ключ, а потом пишет его, и два
+    процесса могут оба получить True. На add() держатся блокировки
+    пересборки в blog.stampede, поэтому файл здесь создаётся через
+    os.link(): он не перезаписывает существующий файл.
+    """
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._createdir()
+        fname = self._key_to_file(key, version)
+        self._cull()
+        fd, tmp_path = tempfile.mkstemp(dir=self._dir)
+        try:
+            with open(fd, "wb") as f:
+                self._write_content(f, timeout, value)
+            # Вторая попытка — если мешал файл с истёкшим сроком.
+            for _ in range(2):
+                try:
+                    os.link(tmp_path, fname)
+                    return True
+                except FileExistsError:
+                    try:
+                        with open(fname, "rb") as f:
+                            if not self._is_expired(f):
+                                return False
+                    except FileNotFoundError:
+                        pass
+            return False
+        finally:
+            os.remove(tmp_path)
@@ -0,0 +1,43 @@
+from uuid import uuid4
+
+from django.core.cache import cache
+
+
+TAG_PREFIX = "blog:tag"
+GLOBAL = "global"
+FEED = "feed"
+
+
+def tag_key(kind, pk=None):
+    return f"{TAG_PREFIX}:{kind}:{pk}"
+
+
+def bump_tag(kind, pk=None):
+    """Инвалидирует всё, что закэшировано с тегом kind:pk.
+
+    Версия тега — случайный токен, а не счётчик: если ключ вытеснен из
+    кэша, новый токен не совпадёт ни с одним старым значением.
+    """
+    cache.set(tag_key(kind, pk), uuid4().hex, None)
+
+
+def post_tag_keys(post):
+    """Теги всего, что выводится в карточке публикации."""
+    return (
+        tag_key(GLOBAL),
+        tag_key("post", post.pk),
+        tag_key("user", post.author_id),
+        tag_key("category", post.category_id),
+        tag_key("location", post.location_id),
+    )
+
+
+def tag_versions(keys):
+    """Текущие токены тегов одним get_many; недостающие создаются."""
+    keys = set(keys)
+    versions = cache.get_many(keys)
+    missing = {key: uuid4().hex for key in keys - versions.keys()}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return versions
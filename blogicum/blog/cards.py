@@ -0,0 +1,32 @@
+import hashlib
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+
+from blog.cache_tags import post_tag_keys, tag_versions
+from blog.constants import POST_CARD_CACHE_TIMEOUT
+from blog.metrics import record_cache
+
+
+def attach_card_versions(posts):
+    """Вычисляет post.card_version для всех карточек одним get_many."""
+    posts = list(posts)
+    versions = tag_versions(
+        key for post in posts for key in post_tag_keys(post)
+    )
+    for post in posts:
+        tokens = ":".join(versions[key] for key in post_tag_keys(post))
+        post.card_version = hashlib.md5(tokens.encode()).hexdigest()
+    return posts
+
+
+def render_post_card(post):
+    if not hasattr(post, "card_version"):
+        attach_card_versions([post])
+    key = f"blog:post-card:{post.pk}:{post.card_version}"
+    html = cache.get(key)
+    record_cache("card", html is not None)
+    if html is None:
+        html = render_to_string("includes/post_card.html", {"post": post})
+        cache.set(key, html, POST_CARD_CACHE_TIMEOUT)
+    return html
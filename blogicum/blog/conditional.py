@@ -0,0 +1,83 @@
+import hashlib
+
+from django.db.models import Max
+
+from blog.cache_tags import FEED, tag_key, tag_versions
+from blog.models import Category, Post, User
+from blog.visibility import is_post_visible, visibility_now
+
+
+def _etag(request, *parts):
+    """Слабый ETag страницы для текущего пользователя.
+
+    В ключ входит интервал видимости, поэтому даже изменения, которые не
+    трогают Post.updated_at (переименование категории, места или автора),
+    попадают к клиентам не позже чем через BLOG_VISIBILITY_BUCKET.
+    Удаление и снятие с публикации не меняют MAX(updated_at), поэтому в
+    ключ входят версии тегов лент, которые сбрасывают сигналы. COUNT здесь
+    не нужен: он превратил бы индексный поиск максимума в полный обход.
+    """
+    user = request.user
+    raw = "|".join(
+        str(part)
+        for part in (
+            request.get_full_path(),
+            user.pk if user.is_authenticated else "anonymous",
+            visibility_now().isoformat(),
+            *parts,
+        )
+    )
+    return 'W/"%s"' % hashlib.md5(raw.encode()).hexdigest()
+
+
+def _feed_versions(kind, pk=None):
+    key = tag_key(kind, pk)
+    return tag_versions([key])[key]
+
+
+def feed_etag(request, *args, **kwargs):
+    row = Post.objects.aggregate(last=Max("updated_at"))
+    return _etag(request, row["last"], _feed_versions(FEED))
+
+
+def category_etag(request, category_slug):
+    row = (
+        Category.objects.filter(slug=category_slug)
+        .values("pk", "is_published", "title", "description")
+        .annotate(last=Max("posts__updated_at"))
+        .first()
+    )
+    if row is None:
+        return None
+    return _etag(
+        request, *row.values(), _feed_versions("category-feed", row["pk"])
+    )
+
+
+def profile_etag(request, username):
+    row = (
+        User.objects.filter(username=username)
+        .values("pk", "first_name", "last_name", "is_staff")
+        .annotate(last=Max("posts__updated_at"))
+        .first()
+    )
+    if row is None:
+        return None
+    return _etag(
+        request, *row.values(), _feed_versions("author-feed", row["pk"])
+    )
+
+
+def post_etag(request, post_id):
+    """ETag публикации.
+
+    Загруженная публикация остаётся в request.visible_post: PostDetailView
+    берёт её оттуда, а не читает из базы второй раз.
+    """
+    if not request.user.is_authenticated:
+        return None
+    post = Post.objects.select_related("category").filter(pk=post_id).first()
+    if post is None or not is_post_visible(post, request.user):
+        return None
+    request.visible_post = post
+    return _etag(request, post.updated_at)
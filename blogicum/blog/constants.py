@@ -1 +1,42 @@
 POSTS_PER_PAGE: int = 10
+COMMENTS_PER_PAGE: int = 20
+
+OUTBOX_BATCH_SIZE: int = 50
+OUTBOX_MAX_ATTEMPTS: int = 5
+OUTBOX_RETRY_DELAY: int = 60
+OUTBOX_CLAIM_TIMEOUT: int = 5 * 60
+
+IMAGE_VARIANT_WIDTHS: tuple = (320, 640, 960)
+IMAGE_VARIANT_FORMATS: tuple = ("WEBP", "JPEG")
+IMAGE_VARIANT_QUALITY: int = 80
+IMAGE_VARIANT_FAILURE_TIMEOUT: int = 5 * 60
+IMAGE_SIZES: str = "(max-width: 640px) 100vw, 640px"
+
+POST_CARD_CACHE_TIMEOUT: int = 60 * 60 * 24
+PAGE_CACHE_TIMEOUT: int = 60 * 5
+
+STAMPEDE_LOCK_TIMEOUT: int = 30
+STAMPEDE_WAIT_TIMEOUT: float = 5.0
+STAMPEDE_POLL_INTERVAL: float = 0.05
+STAMPEDE_BETA: float = 1.0
+
+PAGINATOR_COUNT_TIMEOUT: int = 60 * 60
+
+VIEW_COUNTER_BATCH_SIZE: int = 500
+
+EXPORT_CHUNK_SIZE: int = 2000
+
+SYNTHETIC_WORKER_BUSY_TIMEOUT: int = 10 * 60 * 1000
+
+METRICS_DUMP_INTERVAL: int = 5
+METRICS_LATENCY_BUCKETS: tuple = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+
+STATIC_COMPRESSED_EXTENSIONS: tuple = (
+    ".css", ".js", ".svg", ".ico", ".txt", ".json", ".map", ".xml",
+)
+STATIC_MIN_COMPRESSION_RATIO: float = 0.95
+STATIC_IMMUTABLE_MAX_AGE: int = 60 * 60 * 24 * 365
+STATIC_MAX_AGE: int = 60
+STATIC_RANGE_CHUNK_SIZE: int = 64 * 1024
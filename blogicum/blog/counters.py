@@ -0,0 +1,22 @@
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def recount_comments(post_model=None, comment_model=None):
+    """Заново вычисляет comment_count одним UPDATE с подзапросом."""
+    if post_model is None or comment_model is None:
+        from blog.models import Comment, Post
+
+        post_model, comment_model = Post, Comment
+    counts = (
+        comment_model.objects.filter(post=OuterRef("pk"))
+        .order_by()
+        .values("post")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return post_model.objects.update(
+        comment_count=Coalesce(
+            Subquery(counts, output_field=IntegerField()), 0
+        )
+    )
@@ -0,0 +1,124 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.dateparse import parse_date
+
+from blog.constants import EXPORT_CHUNK_SIZE
+from blog.models import Comment, Post
+
+
+EXPORTS = {
+    "posts": (
+        Post,
+        "pub_date",
+        "category__slug",
+        (
+            "id",
+            "title",
+            "text",
+            "pub_date",
+            "is_published",
+            "author__username",
+            "category__slug",
+            "location__name",
+            "comment_count",
+            "views",
+        ),
+    ),
+    "comments": (
+        Comment,
+        "created_at",
+        "post__category__slug",
+        (
+            "id",
+            "post_id",
+            "author__username",
+            "text",
+            "created_at",
+        ),
+    ),
+}
+FORMATS = {
+    "jsonl": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _date(value, name):
+    if not value:
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError(f"{name}: ожидается дата в формате ГГГГ-ММ-ДД.")
+    return parsed
+
+
+def export_rows(
+    kind,
+    category=None,
+    author=None,
+    since=None,
+    until=None,
+    chunk_size=EXPORT_CHUNK_SIZE,
+):
+    """Строки выгрузки словарями; в памяти не больше chunk_size строк.
+
+    since и until — даты включительно (ГГГГ-ММ-ДД); неверные значения
+    вызывают ValueError.
+    """
+    if kind not in EXPORTS:
+        raise ValueError(f"Неизвестная выгрузка: {kind}.")
+    model, date_field, category_field, fields = EXPORTS[kind]
+    lookups = {}
+    if category:
+        lookups[category_field] = category
+    if author:
+        lookups["author__username"] = author
+    since = _date(since, "since")
+    if since:
+        lookups[f"{date_field}__date__gte"] = since
+    until = _date(until, "until")
+    if until:
+        lookups[f"{date_field}__date__lte"] = until
+    return (
+        model.objects.filter(**lookups)
+        .order_by("pk")
+        .values(*fields)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def export_fields(kind):
+    return EXPORTS[kind][3]
+
+
+def iter_jsonl(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+class _Echo:
+    """Буфер для csv.writer, который сразу возвращает записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows, fields):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([row[field] for field in fields])
+
+
+def iter_export(kind, fmt, **filters):
+    rows = export_rows(kind, **filters)
+    if fmt == "csv":
+        return iter_csv(rows, export_fields(kind))
+    if fmt == "jsonl":
+        return iter_jsonl(rows)
+    raise ValueError(f"Неизвестный формат: {fmt}.")
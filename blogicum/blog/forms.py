@@ -1,7 +1,8 @@
 from django import forms
-from django.core.mail import send_mail
+from django.db import transaction
 
 from blog.models import Post, Comment
+from blog.outbox import enqueue_email
 
 
 class PostForm(forms.ModelForm):
@@ -13,16 +14,19 @@ class PostForm(forms.ModelForm):
         model = Post
         exclude = ("author",)
 
-    def clean(self):
-        super().clean()
-        send_mail(
-            subject="Новая публикация!",
-            message=f"Новая публикация \"{self.cleaned_data.get('title')}\"."
-            f"с названием {self.cleaned_data['title']}",
-            from_email="publicat_form@blogicum.not",
-            recipient_list=["admin@blogicum.not"],
-            fail_silently=True,
-        )
+    def save(self, commit=True):
+        if not commit:
+            return super().save(commit)
+        # Письмо попадает в очередь только вместе с сохранённой публикацией.
+        with transaction.atomic():
+            instance = super().save(commit)
+            enqueue_email(
+                subject="Новая публикация!",
+                message=f"Новая публикация \"{instance.title}\".",
+                from_email="publicat_form@blogicum.not",
+                recipient_list=["admin@blogicum.not"],
+            )
+        return instance
 
 
 class CommentForm(forms.ModelForm):
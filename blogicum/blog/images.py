@@ -0,0 +1,96 @@
+import os
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from PIL import Image
+
+from blog.constants import (
+    IMAGE_VARIANT_FAILURE_TIMEOUT,
+    IMAGE_VARIANT_FORMATS,
+    IMAGE_VARIANT_QUALITY,
+    IMAGE_VARIANT_WIDTHS,
+)
+from blog.metrics import record_cache
+from blog.models import Post
+
+
+EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg"}
+MIME_TYPES = {"WEBP": "image/webp", "JPEG": "image/jpeg"}
+
+
+def variant_name(name, width, image_format):
+    root, _ = os.path.splitext(name)
+    return f"{root}.{width}w.{EXTENSIONS[image_format]}"
+
+
+def _cache_key(name):
+    return f"blog:image-variants:{name}"
+
+
+def generate_variants(storage, name):
+    """Создаёт уменьшенные копии картинки рядом с оригиналом.
+
+    Возвращает пару (ширина оригинала, список (ширина, формат, имя)).
+    Копии шире оригинала не создаются; готовые файлы не перезаписываются.
+    Неудача тоже кэшируется, но ненадолго, чтобы битая картинка не
+    открывалась заново при каждой отрисовке. После удачи публикации с
+    этой картинкой выходят из очереди variant_backlog().
+    """
+    try:
+        with storage.open(name, "rb") as source:
+            image = Image.open(source)
+            image.load()
+    except (OSError, ValueError):
+        result = (None, [])
+        cache.set(_cache_key(name), result, IMAGE_VARIANT_FAILURE_TIMEOUT)
+        return result
+    variants = []
+    for width in IMAGE_VARIANT_WIDTHS:
+        if width >= image.width:
+            continue
+        resized = None
+        for image_format in IMAGE_VARIANT_FORMATS:
+            target = variant_name(name, width, image_format)
+            if not storage.exists(target):
+                if resized is None:
+                    height = max(1, round(image.height * width / image.width))
+                    resized = image.convert("RGB").resize(
+                        (width, height), Image.Resampling.LANCZOS
+                    )
+                buffer = BytesIO()
+                resized.save(
+                    buffer, image_format, quality=IMAGE_VARIANT_QUALITY
+                )
+                storage.save(target, ContentFile(buffer.getvalue()))
+            variants.append((width, image_format, target))
+    result = (image.width, variants)
+    cache.set(_cache_key(name), result, None)
+    # exclude() повторяет условие индекса post_variant_backlog_idx, иначе
+    # SQLite обходит всю таблицу.
+    Post.objects.filter(image=name, image_variants_ready=False).exclude(
+        image=""
+    ).update(image_variants_ready=True)
+    return result
+
+
+def get_variants(field_file):
+    """Варианты картинки; недостающие создаются при первом обращении."""
+    result = cache.get(_cache_key(field_file.name))
+    record_cache("image-variants", result is not None)
+    if result is None:
+        result = generate_variants(field_file.storage, field_file.name)
+    return result
+
+
+def variant_backlog():
+    """Публикации, картинки которых ещё ждут уменьшенных копий.
+
+    Считается по частичному индексу post_variant_backlog_idx, поэтому
+    стоит пропорционально очереди, а не числу публикаций.
+    """
+    return (
+        Post.objects.filter(image_variants_ready=False)
+        .exclude(image="")
+        .count()
+    )
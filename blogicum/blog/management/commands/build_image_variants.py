@@ -0,0 +1,49 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.images import generate_variants
+from blog.models import Post
+from blog.workers import process_pool
+
+
+def _build(name):
+    """Число копий картинки; None — оригинал не удалось прочитать."""
+    storage = Post._meta.get_field("image").storage
+    width, variants = generate_variants(storage, name)
+    return None if width is None else len(variants)
+
+
+class Command(BaseCommand):
+    help = "Создаёт уменьшенные копии картинок для уже сохранённых публикаций."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count(),
+            help="Число процессов; 1 — без пула.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=16)
+
+    def handle(self, *args, **options):
+        names = list(
+            Post.objects.exclude(image="")
+            .order_by()
+            .values_list("image", flat=True)
+            .distinct()
+        )
+        started = time.monotonic()
+        if options["processes"] > 1:
+            with process_pool(options["processes"]) as pool:
+                counts = list(
+                    pool.map(_build, names, chunksize=options["chunk_size"])
+                )
+        else:
+            counts = [_build(name) for name in names]
+        failed = counts.count(None)
+        self.stdout.write(
+            f"Картинок: {len(names)}, копий: {sum(filter(None, counts))}, "
+            f"без копий: {failed}, за {time.monotonic() - started:.1f} с"
+        )
@@ -0,0 +1,73 @@
+import sys
+import time
+from contextlib import nullcontext
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.bulk_load import (
+    LOADABLE_MODELS,
+    BulkLoader,
+    deferred_indexes,
+    iter_fixture,
+    refresh_after_bulk_insert,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Потоково загружает фикстуру (JSON dumpdata или JSON Lines) "
+        "пачками через bulk_create."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Файл фикстуры или - для stdin.")
+        parser.add_argument(
+            "--format", choices=("json", "jsonl"), default=None
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--defer-indexes",
+            action="store_true",
+            help="Удалить индексы на время загрузки и построить заново.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size должен быть положительным.")
+        if options["defer_indexes"]:
+            models = [apps.get_model(label) for label in LOADABLE_MODELS]
+            indexes = deferred_indexes(models)
+        else:
+            indexes = nullcontext()
+        loader = BulkLoader(options["batch_size"])
+        started = time.perf_counter()
+        try:
+            fh = (
+                sys.stdin
+                if options["path"] == "-"
+                else open(options["path"], encoding="utf-8")
+            )
+        except OSError as error:
+            raise CommandError(error)
+        with fh, indexes:
+            loader.load(iter_fixture(fh, options["format"]))
+        elapsed = time.perf_counter() - started
+
+        refresh_after_bulk_insert(
+            recount=bool(
+                loader.loaded["blog.Post"] or loader.loaded["blog.Comment"]
+            )
+        )
+
+        total = sum(loader.loaded.values())
+        for label, count in loader.loaded.items():
+            self.stdout.write(f"{label}: {count}")
+        for label, count in loader.skipped.items():
+            self.stdout.write(f"Пропущено {label}: {count}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Загружено строк: {total} за {elapsed:.2f} с "
+                f"({total / max(elapsed, 1e-9):.0f} строк/с)"
+            )
+        )
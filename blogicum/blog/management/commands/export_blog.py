@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.constants import EXPORT_CHUNK_SIZE
+from blog.export import EXPORTS, FORMATS, iter_export
+
+
+class Command(BaseCommand):
+    help = "Потоково выгружает публикации или комментарии в JSON Lines/CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=tuple(EXPORTS))
+        parser.add_argument(
+            "--format", choices=tuple(FORMATS), default="jsonl"
+        )
+        parser.add_argument("--category", help="Слаг категории.")
+        parser.add_argument("--author", help="Имя пользователя автора.")
+        parser.add_argument("--since", help="С даты (ГГГГ-ММ-ДД).")
+        parser.add_argument("--until", help="По дату включительно.")
+        parser.add_argument(
+            "--chunk-size", type=int, default=EXPORT_CHUNK_SIZE
+        )
+        parser.add_argument(
+            "--output", "-o", help="Файл выгрузки; по умолчанию stdout."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            chunks = iter_export(
+                options["kind"],
+                options["format"],
+                category=options["category"],
+                author=options["author"],
+                since=options["since"],
+                until=options["until"],
+                chunk_size=options["chunk_size"],
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        if options["output"]:
+            with open(
+                options["output"], "w", encoding="utf-8", newline=""
+            ) as fh:
+                fh.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
@@ -0,0 +1,159 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from blog.bulk_load import refresh_after_bulk_insert
+from blog.constants import SYNTHETIC_WORKER_BUSY_TIMEOUT
+from blog.models import Comment
+from blog.sqlite import apply_pragmas
+from blog.synthetic import (
+    create_categories,
+    create_comments,
+    create_locations,
+    create_posts,
+    create_users,
+    next_pk,
+    pareto_cum_weights,
+    zipf_cum_weights,
+)
+from blog.workers import process_pool
+
+_shared = {}
+
+
+def _init_worker(shared):
+    _shared.update(shared)
+    if connection.vendor == "sqlite":
+        # Писатель в SQLite один: процессы ждут очереди, а не падают.
+        with connection.cursor() as cursor:
+            apply_pragmas(
+                cursor, {"busy_timeout": SYNTHETIC_WORKER_BUSY_TIMEOUT}
+            )
+
+
+def _comments_chunk(task):
+    index, count, first_pk = task
+    return create_comments(
+        index=index, count=count, first_pk=first_pk, **_shared
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Создаёт синтетический набор данных для нагрузочного тестирования: "
+        "авторы по Ципфу, комментарии с тяжёлым хвостом."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--locations", type=int, default=50)
+        parser.add_argument("--posts", type=int, default=100_000)
+        parser.add_argument("--comments", type=int, default=1_000_000)
+        parser.add_argument("--future-share", type=float, default=0.02)
+        parser.add_argument("--unpublished-share", type=float, default=0.05)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100_000,
+            help="Комментариев в одном задании пула процессов.",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Число процессов для комментариев; 1 — без пула.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--prefix",
+            default="synthetic",
+            help="Префикс имён пользователей и слагов категорий.",
+        )
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["categories"] < 1:
+            raise CommandError("Нужен хотя бы один автор и одна категория.")
+        if options["comments"] and options["posts"] < 1:
+            raise CommandError("Комментариям нужны публикации.")
+        rng = random.Random(options["seed"])
+        batch_size = options["batch_size"]
+        started = time.perf_counter()
+
+        user_ids = create_users(
+            rng, options["users"], options["prefix"], batch_size
+        )
+        category_ids = create_categories(
+            rng,
+            options["categories"],
+            options["prefix"],
+            options["unpublished_share"],
+            batch_size,
+        )
+        location_ids = create_locations(rng, options["locations"], batch_size)
+        post_ids, post_dates = create_posts(
+            rng,
+            options["posts"],
+            user_ids,
+            category_ids,
+            location_ids,
+            options["future_share"],
+            options["unpublished_share"],
+            batch_size,
+        )
+        self._report("Публикации", options["posts"], started)
+
+        comments_started = time.perf_counter()
+        now = timezone.now()
+        # Отложенные публикации ещё не вышли, и комментировать их рано.
+        post_weights = pareto_cum_weights(
+            rng, len(post_ids), allowed=[date <= now for date in post_dates]
+        )
+        if options["comments"] and not post_weights[-1]:
+            raise CommandError("Комментариям нужны вышедшие публикации.")
+        shared = {
+            "seed": options["seed"],
+            "now": now,
+            "post_ids": post_ids,
+            "post_dates": post_dates,
+            "post_weights": post_weights,
+            "user_ids": user_ids,
+            "author_weights": zipf_cum_weights(len(user_ids)),
+            "batch_size": batch_size,
+        }
+        first_pk = next_pk(Comment)
+        chunk = options["chunk_size"]
+        total = options["comments"]
+        tasks = [
+            (index, min(chunk, total - offset), first_pk + offset)
+            for index, offset in enumerate(range(0, total, chunk))
+        ]
+        if options["processes"] > 1:
+            with process_pool(
+                options["processes"],
+                initializer=_init_worker,
+                initargs=(shared,),
+            ) as pool:
+                created = sum(pool.map(_comments_chunk, tasks))
+        else:
+            _shared.update(shared)
+            created = sum(map(_comments_chunk, tasks))
+        self._report("Комментарии", created, comments_started)
+
+        refresh_after_bulk_insert()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Готово за {time.perf_counter() - started:.1f} с"
+            )
+        )
+
+    def _report(self, label, count, started):
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{label}: {count} за {elapsed:.1f} с "
+            f"({count / max(elapsed, 1e-9):.0f} строк/с)"
+        )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.cache_tags import GLOBAL, bump_tag
+from blog.counters import recount_comments
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает Post.comment_count по таблице комментариев."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = recount_comments()
+        bump_tag(GLOBAL)
+        self.stdout.write(
+            self.style.SUCCESS(f"Пересчитано публикаций: {updated}")
+        )
@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.constants import (
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_RETRY_DELAY,
+)
+from blog.outbox import send_batch
+
+
+class Command(BaseCommand):
+    help = "Отправляет письма из очереди OutboxEmail."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=OUTBOX_BATCH_SIZE
+        )
+        parser.add_argument(
+            "--max-attempts", type=int, default=OUTBOX_MAX_ATTEMPTS
+        )
+        parser.add_argument(
+            "--retry-delay",
+            type=int,
+            default=OUTBOX_RETRY_DELAY,
+            help="Задержка перед первой повторной попыткой, в секундах.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Не завершаться, а опрашивать очередь каждые --interval с.",
+        )
+        parser.add_argument("--interval", type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        while True:
+            total_sent = total_failed = 0
+            while True:
+                sent, failed = send_batch(
+                    batch_size=options["batch_size"],
+                    max_attempts=options["max_attempts"],
+                    retry_delay=options["retry_delay"],
+                )
+                total_sent += sent
+                total_failed += failed
+                if sent + failed < options["batch_size"]:
+                    break
+            if total_sent or total_failed or not options["loop"]:
+                self.stdout.write(
+                    f"Отправлено: {total_sent}, ошибок: {total_failed}"
+                )
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,43 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.replicas import read_replicas, sync_replica
+
+
+class Command(BaseCommand):
+    help = "Обновляет реплики SQLite копией основной базы (VACUUM INTO)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "aliases",
+            nargs="*",
+            help="Псевдонимы реплик; по умолчанию BLOG_READ_REPLICAS.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Не завершаться, а обновлять реплики каждые --interval с.",
+        )
+        parser.add_argument("--interval", type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        aliases = options["aliases"] or read_replicas()
+        if not aliases:
+            raise CommandError("Реплики не настроены (BLOG_READ_REPLICAS).")
+        for alias in aliases:
+            if alias not in settings.DATABASES:
+                raise CommandError(f"Нет базы с псевдонимом {alias}.")
+        while True:
+            for alias in aliases:
+                started = time.perf_counter()
+                sync_replica(settings.DATABASES[alias]["NAME"])
+                elapsed = time.perf_counter() - started
+                if not options["loop"]:
+                    self.stdout.write(
+                        f"Реплика {alias} обновлена за {elapsed:.2f} с"
+                    )
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
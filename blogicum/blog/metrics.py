@@ -0,0 +1,293 @@
+import atexit
+import bisect
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+from blog.constants import METRICS_DUMP_INTERVAL, METRICS_LATENCY_BUCKETS
+
+
+METRICS = {
+    "blog_requests_total": (
+        "counter",
+        "Запросы по имени view, методу и статусу.",
+    ),
+    "blog_request_duration_seconds": (
+        "histogram",
+        "Время обработки запроса по имени view.",
+    ),
+    "blog_db_queries_total": ("counter", "SQL-запросы по имени view."),
+    "blog_db_duration_seconds_total": (
+        "counter",
+        "Время SQL-запросов по имени view.",
+    ),
+    "blog_cache_hits_total": ("counter", "Попадания в кэш по его назначению."),
+    "blog_cache_misses_total": ("counter", "Промахи кэша по его назначению."),
+    "blog_outbox_pending": ("gauge", "Письма, ожидающие отправки."),
+    "blog_image_variant_backlog": (
+        "gauge",
+        "Картинки без уменьшенных копий после build_image_variants.",
+    ),
+}
+
+
+# Суммы снимков завершившихся процессов.
+ARCHIVE = "archive.json"
+
+
+def metrics_dir():
+    directory = getattr(settings, "BLOG_METRICS_DIR", None)
+    return Path(directory) if directory else None
+
+
+@contextmanager
+def _locked(directory, operation):
+    """Блокировка каталога: архив пополняют и читают не одновременно."""
+    with open(directory / ".lock", "a") as fh:
+        fcntl.flock(fh, operation)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _snapshot_pid(path):
+    """PID процесса из имени «<pid>-<токен>.json»; None — не снимок."""
+    pid = path.stem.partition("-")[0]
+    return int(pid) if pid.isdigit() else None
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class MetricsRegistry:
+    """Счётчики и гистограммы процесса, безопасные для потоков.
+
+    Значения только растут, поэтому снимки разных процессов складываются:
+    каждый процесс не чаще раза в METRICS_DUMP_INTERVAL секунд пишет свой
+    снимок в BLOG_METRICS_DIR, а /metrics суммирует все файлы каталога.
+    В имени снимка кроме PID есть случайный токен, чтобы процесс с
+    повторно выданным PID не затёр чужие суммы. Снимки завершившихся
+    процессов переносятся в ARCHIVE — так счётчики не убывают, а каталог
+    не растёт. PID проверяются локально, поэтому каталог не должен быть
+    общим для нескольких машин.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._histograms = {}
+        self._dumped = time.monotonic()
+        self.filename = f"{os.getpid()}-{uuid.uuid4().hex}.json"
+
+    def inc(self, name, labels=(), value=1):
+        with self._lock:
+            self._counters[name, labels] += value
+
+    def observe(self, name, value, labels=(), buckets=METRICS_LATENCY_BUCKETS):
+        with self._lock:
+            histogram = self._histograms.get((name, labels))
+            if histogram is None:
+                histogram = self._histograms[name, labels] = {
+                    "buckets": list(buckets),
+                    "counts": [0] * (len(buckets) + 1),
+                    "sum": 0.0,
+                }
+            histogram["counts"][bisect.bisect_left(buckets, value)] += 1
+            histogram["sum"] += value
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "counters": [
+                    [name, [list(pair) for pair in labels], value]
+                    for (name, labels), value in self._counters.items()
+                ],
+                "histograms": [
+                    [
+                        name,
+                        [list(pair) for pair in labels],
+                        dict(histogram, counts=list(histogram["counts"])),
+                    ]
+                    for (name, labels), histogram in self._histograms.items()
+                ],
+            }
+
+    def dump(self, directory=None):
+        directory = directory or metrics_dir()
+        if directory is None:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        _write(directory / self.filename, self.snapshot())
+        self._dumped = time.monotonic()
+        archive_dead(directory)
+
+    def maybe_dump(self):
+        if time.monotonic() - self._dumped >= METRICS_DUMP_INTERVAL:
+            self.dump()
+
+
+registry = MetricsRegistry()
+atexit.register(registry.dump)
+# Дочерний процесс не должен повторно отдать счётчики родителя.
+os.register_at_fork(after_in_child=registry.clear)
+
+
+def record_cache(cache_name, hit):
+    name = "blog_cache_hits_total" if hit else "blog_cache_misses_total"
+    registry.inc(name, (("cache", cache_name),))
+
+
+def _write(path, snapshot):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w") as fh:
+        json.dump(snapshot, fh)
+    os.replace(tmp, path)
+
+
+def _read(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        # Файл удалили или ещё не дописали — учтём в следующий раз.
+        return None
+
+
+def archive_dead(directory):
+    """Переносит снимки завершившихся процессов в ARCHIVE."""
+    with _locked(directory, fcntl.LOCK_EX):
+        dead = [
+            path
+            for path in directory.glob("*.json")
+            if (pid := _snapshot_pid(path)) is not None
+            and not _is_alive(pid)
+        ]
+        if not dead:
+            return
+        archive = directory / ARCHIVE
+        snapshots = [_read(path) for path in [archive, *dead]]
+        _write(archive, _as_snapshot(*_merge(filter(None, snapshots))))
+        for path in dead:
+            path.unlink()
+
+
+def _snapshots(directory):
+    if directory is not None and directory.is_dir():
+        with _locked(directory, fcntl.LOCK_SH):
+            for path in directory.glob("*.json"):
+                if path.name == registry.filename:
+                    continue
+                snapshot = _read(path)
+                if snapshot is not None:
+                    yield snapshot
+    yield registry.snapshot()
+
+
+def _merge(snapshots):
+    counters = defaultdict(float)
+    histograms = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot["counters"]:
+            counters[name, tuple(map(tuple, labels))] += value
+        for name, labels, histogram in snapshot["histograms"]:
+            key = name, tuple(map(tuple, labels))
+            total = histograms.setdefault(
+                key,
+                {
+                    "buckets": histogram["buckets"],
+                    "counts": [0] * len(histogram["counts"]),
+                    "sum": 0.0,
+                },
+            )
+            for i, count in enumerate(histogram["counts"]):
+                total["counts"][i] += count
+            total["sum"] += histogram["sum"]
+    return counters, histograms
+
+
+def _as_snapshot(counters, histograms):
+    return {
+        "counters": [
+            [name, [list(pair) for pair in labels], value]
+            for (name, labels), value in counters.items()
+        ],
+        "histograms": [
+            [name, [list(pair) for pair in labels], histogram]
+            for (name, labels), histogram in histograms.items()
+        ],
+    }
+
+
+def collect(directory=None):
+    """Суммы счётчиков и гистограмм всех процессов."""
+    return _merge(_snapshots(directory or metrics_dir()))
+
+
+def _escape(value):
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\n", "\\n")
+        .replace('"', '\\"')
+    )
+
+
+def _labels(labels, extra=()):
+    pairs = tuple(labels) + tuple(extra)
+    if not pairs:
+        return ""
+    inner = ",".join(f'{key}="{_escape(value)}"' for key, value in pairs)
+    return f"{{{inner}}}"
+
+
+def _number(value):
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+def render(counters, histograms, gauges):
+    """Текстовый формат Prometheus 0.0.4."""
+    samples = defaultdict(list)
+    for (name, labels), value in sorted(counters.items()):
+        samples[name].append(f"{name}{_labels(labels)} {_number(value)}")
+    for (name, labels), histogram in sorted(histograms.items()):
+        cumulative = 0
+        bounds = [*map(_number, histogram["buckets"]), "+Inf"]
+        for bound, count in zip(bounds, histogram["counts"]):
+            cumulative += count
+            samples[name].append(
+                f"{name}_bucket{_labels(labels, (('le', bound),))} "
+                f"{cumulative}"
+            )
+        samples[name].append(
+            f"{name}_sum{_labels(labels)} {_number(histogram['sum'])}"
+        )
+        samples[name].append(f"{name}_count{_labels(labels)} {cumulative}")
+    for name, value in gauges.items():
+        samples[name].append(f"{name} {_number(value)}")
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(samples[name])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,169 @@
+import os
+import time
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils._os import safe_join
+
+from blog.metrics import registry
+from blog.replicas import allow_replica_reads, read_replicas, request_routing
+from blog.static_serve import is_hashed_name, serve_static
+from blog.timing import (
+    current_timings,
+    instrument_templates,
+    logger as timing_logger,
+    measure_request,
+)
+
+
+class ReadReplicaMiddleware:
+    """Отправляет чтение GET-запросов к blog.views на реплики.
+
+    После запроса с записью пользователь получает cookie, и следующие
+    BLOG_PRIMARY_PIN_SECONDS секунд его запросы читают из основной базы,
+    чтобы он сразу видел свои изменения, даже если реплика отстаёт.
+    """
+
+    cookie_name = "blog_primary_until"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_routing() as state:
+            response = self.get_response(request)
+        if state["wrote"] and read_replicas():
+            window = getattr(settings, "BLOG_PRIMARY_PIN_SECONDS", 10)
+            response.set_cookie(
+                self.cookie_name,
+                str(int(time.time()) + window),
+                max_age=window,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def _is_pinned(self, request):
+        try:
+            return int(request.COOKIES[self.cookie_name]) > time.time()
+        except (KeyError, ValueError):
+            return False
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method in ("GET", "HEAD")
+            and view_func.__module__ == "blog.views"
+            and not self._is_pinned(request)
+        ):
+            allow_replica_reads()
+
+
+class RequestTimingMiddleware:
+    """Замеряет запрос: число и время SQL, отрисовку шаблонов и итог.
+
+    Результат уходит в заголовок Server-Timing и строкой в лог
+    blog.timing; запросы к базе дольше BLOG_SLOW_QUERY_MS логируются с SQL
+    и именем view. При BLOG_REQUEST_TIMING = False Django исключает
+    middleware из цепочки, и накладных расходов нет.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "BLOG_REQUEST_TIMING", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        instrument_templates()
+
+    def __call__(self, request):
+        with measure_request() as timings:
+            response = self.get_response(request)
+        response["Server-Timing"] = timings.server_timing()
+        timing_logger.info(
+            "%s %s %s view=%s queries=%d db=%.1fms templates=%.1fms "
+            "total=%.1fms",
+            request.method,
+            request.path,
+            response.status_code,
+            timings.view,
+            timings.queries,
+            timings.db * 1000,
+            timings.templates * 1000,
+            timings.total * 1000,
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                **timings.as_dict(),
+            },
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = current_timings()
+        if timings is not None:
+            timings.view = request.resolver_match.view_name
+
+
+class MetricsMiddleware:
+    """Считает запросы, их время и SQL по имени view для /metrics.
+
+    Включается BLOG_METRICS; если включена и RequestTimingMiddleware,
+    замеры SQL не ведутся дважды.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "BLOG_METRICS", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with measure_request() as timings:
+            response = self.get_response(request)
+            elapsed = time.perf_counter() - timings.started
+        match = request.resolver_match
+        # Без имени view метки не плодятся от случайных адресов.
+        view = match.view_name if match else "<unresolved>"
+        labels = (("view", view),)
+        registry.inc(
+            "blog_requests_total",
+            labels
+            + (
+                ("method", request.method),
+                ("status", str(response.status_code)),
+            ),
+        )
+        registry.observe("blog_request_duration_seconds", elapsed, labels)
+        registry.inc("blog_db_queries_total", labels, timings.queries)
+        registry.inc("blog_db_duration_seconds_total", labels, timings.db)
+        registry.maybe_dump()
+        return response
+
+
+class StaticFilesMiddleware:
+    """Отдаёт собранную collectstatic статику без отдельного веб-сервера.
+
+    Выбирает .br или .gz по Accept-Encoding и поддерживает Range. Файлы с
+    хэшем из манифеста кэшируются браузером на год, остальные — на
+    STATIC_MAX_AGE секунд. Файлов нет в STATIC_ROOT — запрос идёт дальше.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "BLOG_SERVE_STATIC", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+
+    def __call__(self, request):
+        if request.method in ("GET", "HEAD") and request.path.startswith(
+            self.prefix
+        ):
+            name = request.path[len(self.prefix):]
+            try:
+                path = safe_join(settings.STATIC_ROOT, name)
+            except ValueError:
+                path = None
+            if path and os.path.isfile(path):
+                return serve_static(
+                    request, path, is_hashed_name(staticfiles_storage, name)
+                )
+        return self.get_response(request)
@@ -0,0 +1,65 @@
+from django.db import migrations
+
+
+def _normalized(column):
+    return f"replace(replace({column}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+CREATE_SQL = (
+    "CREATE VIRTUAL TABLE blog_post_fts USING fts5("
+    "title, text, content='', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER blog_post_fts_insert AFTER INSERT ON blog_post BEGIN "
+    "INSERT INTO blog_post_fts(rowid, title, text) VALUES ("
+    f"new.id, {_normalized('new.title')}, {_normalized('new.text')}); "
+    "END",
+    "CREATE TRIGGER blog_post_fts_delete AFTER DELETE ON blog_post BEGIN "
+    "INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text) VALUES ("
+    f"'delete', old.id, {_normalized('old.title')}, "
+    f"{_normalized('old.text')}); "
+    "END",
+    "CREATE TRIGGER blog_post_fts_update AFTER UPDATE OF title, text "
+    "ON blog_post BEGIN "
+    "INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text) VALUES ("
+    f"'delete', old.id, {_normalized('old.title')}, "
+    f"{_normalized('old.text')}); "
+    "INSERT INTO blog_post_fts(rowid, title, text) VALUES ("
+    f"new.id, {_normalized('new.title')}, {_normalized('new.text')}); "
+    "END",
+    "INSERT INTO blog_post_fts(rowid, title, text) "
+    f"SELECT id, {_normalized('title')}, {_normalized('text')} "
+    "FROM blog_post",
+)
+
+DROP_SQL = (
+    "DROP TRIGGER IF EXISTS blog_post_fts_insert",
+    "DROP TRIGGER IF EXISTS blog_post_fts_delete",
+    "DROP TRIGGER IF EXISTS blog_post_fts_update",
+    "DROP TABLE IF EXISTS blog_post_fts",
+)
+
+
+def _execute(schema_editor, statements):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in statements:
+        schema_editor.execute(sql, params=None)
+
+
+def create_search_index(apps, schema_editor):
+    _execute(schema_editor, CREATE_SQL)
+
+
+def drop_search_index(apps, schema_editor):
+    _execute(schema_editor, DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_outboxemail'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,14 +1,35 @@
-from django.shortcuts import redirect, get_object_or_404
+from django.shortcuts import redirect
 
-from blog.models import Post
 
+class AuthorObjectMixin:
+    """Загружает объект один раз за запрос.
 
-class PostDispatchMixin:
+    Проверка авторства в dispatch() и UpdateView/DeleteView работают с
+    одним и тем же экземпляром, поэтому второго SELECT не бывает.
+    """
+
+    only_fields = None
+    related_fields = ()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.related_fields:
+            queryset = queryset.select_related(*self.related_fields)
+        if self.only_fields:
+            queryset = queryset.only(*self.only_fields)
+        return queryset
+
+    def get_object(self, queryset=None):
+        if getattr(self, "_object", None) is None:
+            self._object = super().get_object(queryset)
+        return self._object
+
+    def is_author(self):
+        return self.get_object().author_id == self.request.user.pk
+
+
+class PostDispatchMixin(AuthorObjectMixin):
     def dispatch(self, request, *args, **kwargs):
-        instance = get_object_or_404(
-            Post,
-            pk=kwargs.get("post_id"),
-        )
-        if instance.author != request.user:
+        if not self.is_author():
             return redirect("blog:post_detail", self.kwargs.get("post_id"))
         return super().dispatch(request, *args, **kwargs)
@@ -1,12 +1,45 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.template.defaultfilters import truncatechars
+from django.utils import timezone
 
 from blog.abstracts import TimeStampedModel
+from blog.visibility import visibility_now
 
 
 User = get_user_model()
 
+FEED_FIELDS = (
+    "title",
+    "text",
+    "pub_date",
+    "is_published",
+    "image",
+    "comment_count",
+    "author__username",
+    "category__title",
+    "category__slug",
+    "category__is_published",
+    "location__name",
+    "location__is_published",
+)
+
+
+class PostQuerySet(models.QuerySet):
+    def published(self, now=None):
+        return self.filter(
+            is_published=True,
+            category__is_published=True,
+            pub_date__lte=now or visibility_now(),
+        )
+
+    def for_feed(self):
+        return (
+            self.select_related("author", "category", "location")
+            .only(*FEED_FIELDS)
+            .order_by("-pub_date")
+        )
+
 
 class Post(TimeStampedModel):
     title = models.CharField(
@@ -56,6 +89,26 @@ class Post(TimeStampedModel):
         blank=True,
     )
 
+    image_variants_ready = models.BooleanField(
+        "Уменьшенные копии картинки готовы",
+        default=False,
+        editable=False,
+    )
+
+    comment_count = models.PositiveIntegerField(
+        "Количество комментариев",
+        default=0,
+        editable=False,
+    )
+    views = models.PositiveBigIntegerField(
+        "Просмотры",
+        default=0,
+        editable=False,
+    )
+    updated_at = models.DateTimeField("Изменено", auto_now=True)
+
+    objects = PostQuerySet.as_manager()
+
     @property
     def short_text(self):
         return truncatechars(self.text, 100)
@@ -63,6 +116,44 @@ class Post(TimeStampedModel):
     class Meta:
         verbose_name = "публикация"
         verbose_name_plural = "Публикации"
+        indexes = (
+            models.Index(
+                fields=("is_published", "pub_date"),
+                name="post_published_pub_date_idx",
+            ),
+            models.Index(
+                fields=("category", "is_published", "pub_date"),
+                name="post_category_pub_date_idx",
+            ),
+            models.Index(
+                fields=("author", "pub_date"),
+                name="post_author_pub_date_idx",
+            ),
+            models.Index(
+                fields=("updated_at",),
+                name="post_updated_at_idx",
+            ),
+            # SQLite не применяет составные индексы к голому условию
+            # "is_published", поэтому ленты идут по частичным индексам.
+            models.Index(
+                fields=("pub_date",),
+                name="post_feed_partial_idx",
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=("category", "pub_date"),
+                name="post_category_partial_idx",
+                condition=models.Q(is_published=True),
+            ),
+            # Очередь картинок без копий: и отметка готовности по имени,
+            # и счётчик для /metrics читают только её.
+            models.Index(
+                fields=("image",),
+                name="post_variant_backlog_idx",
+                condition=models.Q(image_variants_ready=False)
+                & ~models.Q(image=""),
+            ),
+        )
 
     def __str__(self):
         return self.title
@@ -134,6 +225,49 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ("created_at",)
+        indexes = (
+            models.Index(
+                fields=("post", "created_at"),
+                name="comment_post_created_idx",
+            ),
+        )
 
     def __str__(self):
         return self.text
+
+
+class OutboxEmail(models.Model):
+    subject = models.CharField("Тема", max_length=256)
+    message = models.TextField("Текст письма")
+    from_email = models.CharField("Отправитель", max_length=256)
+    recipients = models.TextField(
+        "Получатели",
+        help_text="По одному адресу в строке.",
+    )
+    created_at = models.DateTimeField("Добавлено", auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField("Попыток отправки", default=0)
+    next_attempt_at = models.DateTimeField(
+        "Следующая попытка",
+        default=timezone.now,
+    )
+    sent_at = models.DateTimeField("Отправлено", null=True, blank=True)
+    last_error = models.TextField("Последняя ошибка", blank=True)
+
+    class Meta:
+        verbose_name = "письмо в очереди"
+        verbose_name_plural = "Очередь писем"
+        ordering = ("id",)
+        indexes = (
+            models.Index(
+                fields=("next_attempt_at",),
+                name="outbox_pending_idx",
+                condition=models.Q(sent_at__isnull=True),
+            ),
+        )
+
+    @property
+    def recipient_list(self):
+        return [line for line in self.recipients.splitlines() if line]
+
+    def __str__(self):
+        return self.subject
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from blog.constants import (
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_CLAIM_TIMEOUT,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_RETRY_DELAY,
+)
+from blog.models import OutboxEmail
+
+
+def enqueue_email(subject, message, from_email, recipient_list):
+    return OutboxEmail.objects.create(
+        subject=subject,
+        message=message,
+        from_email=from_email,
+        recipients="\n".join(recipient_list),
+    )
+
+
+def pending_emails(max_attempts=OUTBOX_MAX_ATTEMPTS):
+    return OutboxEmail.objects.filter(
+        sent_at__isnull=True,
+        attempts__lt=max_attempts,
+        next_attempt_at__lte=timezone.now(),
+    )
+
+
+def claim(emails, timeout=OUTBOX_CLAIM_TIMEOUT):
+    """Забирает письма себе: переносит следующую попытку на timeout.
+
+    Условный UPDATE проходит только у одного обработчика, поэтому
+    параллельные send_outbox не отправят письмо дважды. Если обработчик
+    упадёт, письмо снова станет доступно через timeout секунд.
+    """
+    lease = timezone.now() + timedelta(seconds=timeout)
+    return [
+        email
+        for email in emails
+        if OutboxEmail.objects.filter(
+            pk=email.pk,
+            sent_at__isnull=True,
+            next_attempt_at=email.next_attempt_at,
+        ).update(next_attempt_at=lease)
+    ]
+
+
+def send_batch(
+    batch_size=OUTBOX_BATCH_SIZE,
+    max_attempts=OUTBOX_MAX_ATTEMPTS,
+    retry_delay=OUTBOX_RETRY_DELAY,
+):
+    """Отправляет пачку писем через одно соединение с бэкендом.
+
+    Возвращает пару (отправлено, с ошибкой). Неудачные письма
+    откладываются с экспоненциально растущей задержкой.
+    """
+    batch = claim(pending_emails(max_attempts)[:batch_size])
+    if not batch:
+        return 0, 0
+    sent = failed = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        try:
+            connection.open()
+        except Exception:
+            # Ошибку подключения запишет попытка отправки каждого письма.
+            pass
+        for email in batch:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.message,
+                from_email=email.from_email,
+                to=email.recipient_list,
+                connection=connection,
+            )
+            email.attempts += 1
+            try:
+                message.send()
+            except Exception as error:
+                failed += 1
+                email.last_error = f"{type(error).__name__}: {error}"
+                email.next_attempt_at = timezone.now() + timedelta(
+                    seconds=retry_delay * 2 ** (email.attempts - 1)
+                )
+            else:
+                sent += 1
+                email.sent_at = timezone.now()
+                email.last_error = ""
+            email.save(
+                update_fields=(
+                    "attempts",
+                    "sent_at",
+                    "last_error",
+                    "next_attempt_at",
+                )
+            )
+    finally:
+        connection.close()
+    return sent, failed
@@ -0,0 +1,105 @@
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.translation import get_language
+
+from blog.cache_tags import post_tag_keys, tag_versions
+from blog.constants import PAGE_CACHE_TIMEOUT
+from blog.metrics import record_cache
+from blog.stampede import get_or_rebuild
+from blog.visibility import visibility_now
+
+
+PAGE_PARAMS = ("page", "cursor")
+
+
+def page_cache_enabled():
+    return getattr(settings, "BLOG_PAGE_CACHE", True)
+
+
+def page_key(request):
+    """Ключ страницы: путь, номер страницы и язык — остальное не влияет."""
+    params = "&".join(
+        f"{name}={request.GET.get(name, '')}" for name in PAGE_PARAMS
+    )
+    digest = hashlib.md5(f"{request.path}?{params}".encode()).hexdigest()
+    language = getattr(request, "LANGUAGE_CODE", get_language())
+    return f"blog:page:{language}:{digest}"
+
+
+def tag_page(request, posts, *keys):
+    """Запоминает теги страницы: собственные и всех её карточек."""
+    request.page_cache_tags = {
+        *keys,
+        *(key for post in posts for key in post_tag_keys(post)),
+    }
+
+
+def _is_cacheable(request):
+    return (
+        request.method in ("GET", "HEAD")
+        and not request.user.is_authenticated
+        and page_cache_enabled()
+    )
+
+
+def _is_current(entry):
+    """Запись актуальна, пока не сменились её теги и интервал видимости.
+
+    Интервал видимости выводит отложенные публикации по расписанию, хотя
+    их появление не вызывает ни одного сигнала.
+    """
+    if entry["bucket"] != visibility_now():
+        return False
+    versions = entry["versions"]
+    return cache.get_many(versions.keys()) == versions
+
+
+def cache_anonymous_page(view):
+    """Кэширует страницу для анонимов, пока не изменится ни один её тег.
+
+    Теги страница сообщает через tag_page(); без них ответ не кэшируется.
+    Устаревшую страницу пересобирает один запрос, остальные в это время
+    получают прежнюю версию.
+    """
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not _is_cacheable(request):
+            return view(request, *args, **kwargs)
+        built = []
+
+        def build():
+            bucket = visibility_now()
+            response = view(request, *args, **kwargs)
+            built.append(response)
+            tags = getattr(request, "page_cache_tags", None)
+            if (
+                tags is None
+                or response.status_code != 200
+                or response.cookies
+            ):
+                return None
+            if hasattr(response, "render"):
+                response.render()
+            return {
+                "bucket": bucket,
+                "versions": tag_versions(tags),
+                "content": response.content,
+                "content_type": response["Content-Type"],
+            }
+
+        entry = get_or_rebuild(
+            page_key(request), build, PAGE_CACHE_TIMEOUT, _is_current
+        )
+        record_cache("page", not built)
+        if built:
+            return built[0]
+        return HttpResponse(
+            entry["content"], content_type=entry["content_type"]
+        )
+
+    return wrapper
@@ -0,0 +1,177 @@
+import base64
+import binascii
+import hashlib
+from collections.abc import Sequence
+
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from blog.cache_tags import tag_key, tag_versions
+from blog.constants import PAGINATOR_COUNT_TIMEOUT
+from blog.metrics import record_cache
+
+
+FORWARD = "n"
+BACKWARD = "p"
+
+
+def encode_cursor(direction, value, pk):
+    raw = f"{direction}|{value.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Возвращает (направление, дата, pk) или None для битого курсора."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        direction, value, pk = raw.split("|")
+        value = parse_datetime(value)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if direction not in (FORWARD, BACKWARD) or value is None:
+        return None
+    return direction, value, pk
+
+
+class CursorPage(Sequence):
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __repr__(self):
+        return f"<CursorPage of {len(self)} objects>"
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset-пагинация по паре (field, id) без OFFSET и COUNT(*).
+
+    Стоимость любой страницы одинакова: запрос идёт по индексу от
+    позиции, зашитой в непрозрачный курсор. По умолчанию — публикации
+    от новых к старым.
+    """
+
+    def __init__(self, object_list, per_page, field="pub_date",
+                 descending=True):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.field = field
+        self.descending = descending
+
+    def get_page(self, cursor):
+        decoded = decode_cursor(cursor)
+        if decoded is None:
+            return self._forward(None)
+        direction, value, pk = decoded
+        if direction == BACKWARD:
+            return self._backward(value, pk)
+        return self._forward((value, pk))
+
+    def _ordering(self, reverse=False):
+        if self.descending != reverse:
+            return f"-{self.field}", "-pk"
+        return self.field, "pk"
+
+    def _beyond(self, value, pk, reverse=False):
+        lookup = "lt" if self.descending != reverse else "gt"
+        return Q(**{f"{self.field}__{lookup}": value}) | Q(
+            **{self.field: value, f"pk__{lookup}": pk}
+        )
+
+    def _cursor(self, direction, obj):
+        return encode_cursor(direction, getattr(obj, self.field), obj.pk)
+
+    def _forward(self, position):
+        queryset = self.object_list.order_by(*self._ordering())
+        if position is not None:
+            queryset = queryset.filter(self._beyond(*position))
+        rows = list(queryset[: self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        next_cursor = previous_cursor = None
+        if has_next:
+            next_cursor = self._cursor(FORWARD, rows[-1])
+        if position is not None and rows:
+            previous_cursor = self._cursor(BACKWARD, rows[0])
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+    def _backward(self, value, pk):
+        queryset = self.object_list.order_by(
+            *self._ordering(reverse=True)
+        ).filter(self._beyond(value, pk, reverse=True))
+        rows = list(queryset[: self.per_page + 1])
+        has_previous = len(rows) > self.per_page
+        rows = rows[: self.per_page][::-1]
+        if not rows:
+            return self._forward(None)
+        next_cursor = self._cursor(FORWARD, rows[-1])
+        previous_cursor = None
+        if has_previous:
+            previous_cursor = self._cursor(BACKWARD, rows[0])
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+
+class ElidedPage(Page):
+
+    @property
+    def elided_page_range(self):
+        """Первые и последние номера и окно вокруг текущей страницы."""
+        return self.paginator.get_elided_page_range(self.number)
+
+
+class ElidedPaginator(Paginator):
+
+    def _get_page(self, *args, **kwargs):
+        return ElidedPage(*args, **kwargs)
+
+
+class CachedCountPaginator(ElidedPaginator):
+    """Кэширует COUNT(*) по тексту запроса и его параметрам.
+
+    Число публикаций меняется только при их публикации, снятии с
+    публикации и переносе, поэтому в ключ входит версия тега
+    COUNT_TAG, которую сбрасывают сигналы.
+    """
+
+    COUNT_TAG = "post-count"
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, "query", None)
+        if query is None:
+            return super().count
+        sql, params = query.sql_with_params()
+        version = tag_versions([tag_key(self.COUNT_TAG)])
+        raw = f"{sql}|{params!r}|{version}"
+        key = f"blog:count:{hashlib.md5(raw.encode()).hexdigest()}"
+        count = cache.get(key)
+        record_cache("count", count is not None)
+        if count is None:
+            count = super().count
+            cache.set(key, count, PAGINATOR_COUNT_TIMEOUT)
+        return count
@@ -0,0 +1,61 @@
+import os
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+_routing = ContextVar("blog_replica_routing", default=None)
+
+
+def read_replicas():
+    return list(getattr(settings, "BLOG_READ_REPLICAS", []))
+
+
+@contextmanager
+def request_routing():
+    """Состояние маршрутизации на время одного запроса."""
+    token = _routing.set({"replica": False, "wrote": False})
+    try:
+        yield _routing.get()
+    finally:
+        _routing.reset(token)
+
+
+def allow_replica_reads():
+    state = _routing.get()
+    if state is not None and not state["wrote"]:
+        state["replica"] = True
+
+
+def record_write():
+    state = _routing.get()
+    if state is not None:
+        state["wrote"] = True
+        state["replica"] = False
+
+
+def replica_for_read():
+    state = _routing.get()
+    replicas = read_replicas()
+    if state is None or not state["replica"] or not replicas:
+        return None
+    return random.choice(replicas)
+
+
+def sync_replica(target, using=DEFAULT_DB_ALIAS):
+    """Снимает согласованную копию основной базы через VACUUM INTO.
+
+    Копия пишется во временный файл и атомарно подменяет реплику, так что
+    читатели видят либо старую, либо новую базу целиком.
+    """
+    target = Path(target)
+    tmp = target.with_name(f"{target.name}.tmp")
+    if tmp.exists():
+        tmp.unlink()
+    with connections[using].cursor() as cursor:
+        cursor.execute("VACUUM INTO %s", [str(tmp)])
+    os.replace(tmp, target)
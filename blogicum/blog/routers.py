@@ -0,0 +1,35 @@
+from django.db import DEFAULT_DB_ALIAS
+
+from blog.replicas import read_replicas, record_write, replica_for_read
+
+
+class ReadReplicaRouter:
+    """Чтение в GET-запросах к blog.views — из реплик, запись — в основную.
+
+    Сессии, пользователи и типы содержимого всегда читаются из основной
+    базы: request.user загружается лениво уже внутри view, и на отставшей
+    реплике только что вошедший или изменивший профиль пользователь
+    оказался бы анонимом или устаревшим.
+    """
+
+    primary_only_apps = ("sessions", "auth", "contenttypes")
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in self.primary_only_apps:
+            return DEFAULT_DB_ALIAS
+        return replica_for_read()
+
+    def db_for_write(self, model, **hints):
+        record_write()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *read_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in read_replicas():
+            return False
+        return None
@@ -0,0 +1,113 @@
+import re
+
+from django.db import connection, connections
+from django.db.models import Q
+
+
+FTS_TABLE = "blog_post_fts"
+MAX_TERMS = 8
+# Окончания, которые отбрасываются перед префиксным поиском: так
+# «публикации» находит и «публикация», и «публикаций».
+RUSSIAN_ENDINGS = sorted(
+    (
+        "иями ями ами ией иям ием иях ого его ому ему ыми ими "
+        "ая яя ое ее ые ие ый ий ой ей ом ем ам ям ах ях ов ев "
+        "ию ья ье ью ия а я о е ы и й у ю ь"
+    ).split(),
+    key=len,
+    reverse=True,
+)
+_fts_available = None
+
+
+def _normalized(column):
+    return f"replace(replace({column}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+_DELETE_OLD = (
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text) VALUES ("
+    f"'delete', old.id, {_normalized('old.title')}, "
+    f"{_normalized('old.text')});"
+)
+_INSERT_NEW = (
+    f"INSERT INTO {FTS_TABLE}(rowid, title, text) VALUES ("
+    f"new.id, {_normalized('new.title')}, {_normalized('new.text')});"
+)
+TRIGGERS_SQL = (
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT "
+    f"ON blog_post BEGIN {_INSERT_NEW} END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE "
+    f"ON blog_post BEGIN {_DELETE_OLD} END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF "
+    f"title, text ON blog_post BEGIN {_DELETE_OLD} {_INSERT_NEW} END",
+)
+
+
+def install_search_triggers(using="default", **kwargs):
+    """Восстанавливает триггеры FTS-индекса после миграций.
+
+    SQLite пересоздаёт таблицу blog_post при изменении её столбцов, и
+    триггеры при этом удаляются — поэтому они ставятся заново по
+    сигналу post_migrate.
+    """
+    target = connections[using]
+    if target.vendor != "sqlite":
+        return
+    if FTS_TABLE not in target.introspection.table_names():
+        return
+    with target.cursor() as cursor:
+        for sql in TRIGGERS_SQL:
+            cursor.execute(sql)
+
+
+def fts_available():
+    global _fts_available
+    if _fts_available is None:
+        _fts_available = (
+            connection.vendor == "sqlite"
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _fts_available
+
+
+def _stem(term):
+    if len(term) < 5 or not re.fullmatch(r"[а-я]+", term):
+        return term
+    for ending in RUSSIAN_ENDINGS:
+        if term.endswith(ending) and len(term) - len(ending) >= 4:
+            return term[: -len(ending)]
+    return term
+
+
+def search_terms(query):
+    terms = re.findall(r"\w+", query.lower().replace("ё", "е"))
+    return [_stem(term) for term in terms[:MAX_TERMS]]
+
+
+def match_expression(terms):
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_posts(queryset, query):
+    """Публикации из queryset, подходящие под запрос, лучшие — первыми.
+
+    В SQLite используется FTS5-индекс blog_post_fts (заголовок весит
+    больше текста); на других СУБД — поиск по вхождению подстроки.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    if not fts_available():
+        condition = Q()
+        for term in terms:
+            condition &= Q(title__icontains=term) | Q(text__icontains=term)
+        return queryset.filter(condition).order_by("-pub_date")
+    return queryset.extra(
+        select={"rank": f"bm25({FTS_TABLE}, 10.0, 1.0)"},
+        tables=[FTS_TABLE],
+        where=[
+            f"{FTS_TABLE}.rowid = blog_post.id",
+            f"{FTS_TABLE} MATCH %s",
+        ],
+        params=[match_expression(terms)],
+    ).order_by("rank", "-pub_date")
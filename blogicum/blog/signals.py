@@ -0,0 +1,129 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import (
+    post_delete,
+    post_init,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from blog.cache_tags import FEED, bump_tag
+from blog.images import get_variants
+from blog.models import Category, Comment, Location, Post, User
+from blog.paginators import CachedCountPaginator
+
+COUNTED_FIELDS = ("is_published", "pub_date", "category_id", "author_id")
+
+
+def _counted_state(post):
+    return tuple(post.__dict__.get(field) for field in COUNTED_FIELDS)
+
+
+@receiver(post_save, sender=Comment)
+def update_post_on_comment_save(sender, instance, created, **kwargs):
+    if kwargs.get("raw"):
+        return
+    changes = {"updated_at": timezone.now()}
+    if created:
+        changes["comment_count"] = F("comment_count") + 1
+        bump_tag("post", instance.post_id)
+    Post.objects.filter(pk=instance.post_id).update(**changes)
+
+
+@receiver(post_delete, sender=Comment)
+def update_post_on_comment_delete(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id).update(
+        comment_count=Greatest(F("comment_count") - 1, 0),
+        updated_at=timezone.now(),
+    )
+    bump_tag("post", instance.post_id)
+
+
+def _image_name(post):
+    # Через __dict__, чтобы не догружать отложенное поле лишним запросом.
+    value = post.__dict__.get("image")
+    return getattr(value, "name", value)
+
+
+@receiver(post_init, sender=Post)
+def remember_image_name(sender, instance, **kwargs):
+    instance._image_name = _image_name(instance)
+
+
+@receiver(pre_save, sender=Post)
+def reset_image_variants_ready(sender, instance, **kwargs):
+    # Для новой картинки копий ещё нет, даже если они были у старой.
+    if "image" in instance.__dict__ and (
+        _image_name(instance) != instance._image_name
+    ):
+        instance.image_variants_ready = False
+
+
+@receiver(post_save, sender=Post)
+def build_image_variants(sender, instance, **kwargs):
+    instance._image_name = _image_name(instance)
+    if kwargs.get("raw") or not instance.image:
+        return
+    if not getattr(settings, "BLOG_IMAGE_VARIANTS_ON_SAVE", True):
+        return
+
+    def build():
+        width, _ = get_variants(instance.image)
+        # generate_variants() отмечает готовность в базе запросом UPDATE.
+        instance.image_variants_ready = width is not None
+
+    # Обработка картинки не держит блокировку записи SQLite, а её ошибка
+    # не откатывает саму публикацию.
+    transaction.on_commit(build)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_post_cards(sender, instance, **kwargs):
+    bump_tag(sender._meta.model_name, instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_post_lists(sender, instance, **kwargs):
+    bump_tag(FEED)
+    if sender is Post:
+        bump_tag("category-feed", instance.category_id)
+        bump_tag("author-feed", instance.author_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_cards(sender, instance, created, **kwargs):
+    update_fields = kwargs.get("update_fields")
+    if created or update_fields is None or "username" in update_fields:
+        bump_tag("user", instance.pk)
+
+
+@receiver(post_init, sender=Post)
+def remember_counted_state(sender, instance, **kwargs):
+    instance._counted_state = _counted_state(instance)
+
+
+@receiver(post_save, sender=Post)
+def invalidate_counts_on_post_save(sender, instance, created, **kwargs):
+    state = _counted_state(instance)
+    if created or state != instance._counted_state:
+        bump_tag(CachedCountPaginator.COUNT_TAG)
+    instance._counted_state = state
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_counts(sender, instance, **kwargs):
+    bump_tag(CachedCountPaginator.COUNT_TAG)
@@ -0,0 +1,32 @@
+from django.conf import settings
+
+from blog.replicas import read_replicas
+
+
+def pragma_statements(pragmas=None):
+    if pragmas is None:
+        pragmas = getattr(settings, "BLOG_SQLITE_PRAGMAS", {})
+    return [f"PRAGMA {name} = {value}" for name, value in pragmas.items()]
+
+
+def apply_pragmas(cursor, pragmas=None):
+    for statement in pragma_statements(pragmas):
+        cursor.execute(statement)
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """Выполняет BLOG_SQLITE_PRAGMAS на каждом новом соединении с SQLite.
+
+    PRAGMA действуют только на своё соединение (кроме journal_mode,
+    который сохраняется в файле базы), поэтому их нельзя задать один раз
+    миграцией.
+    """
+    if connection.vendor != "sqlite":
+        return
+    pragmas = dict(getattr(settings, "BLOG_SQLITE_PRAGMAS", {}))
+    if connection.alias in read_replicas():
+        # Файл реплики целиком подменяется sync_replica(); журнал WAL от
+        # старого файла нельзя оставлять рядом с новым.
+        pragmas.pop("journal_mode", None)
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, pragmas)
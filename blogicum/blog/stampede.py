@@ -0,0 +1,89 @@
+import math
+import random
+import time
+
+from django.core.cache import cache
+
+from blog.constants import (
+    STAMPEDE_BETA,
+    STAMPEDE_LOCK_TIMEOUT,
+    STAMPEDE_POLL_INTERVAL,
+    STAMPEDE_WAIT_TIMEOUT,
+)
+
+
+def _lock_key(key):
+    return f"{key}:lock"
+
+
+def _expired(entry, now, beta):
+    """Вероятностное раннее обновление (XFetch).
+
+    Чем ближе срок и чем дольше пересборка (delta), тем вероятнее, что
+    запрос обновит значение заранее, пока остальные ещё получают старое.
+    """
+    jitter = -entry["delta"] * beta * math.log(1.0 - random.random())
+    return now + jitter >= entry["expires"]
+
+
+def _wait_for(key, usable):
+    deadline = time.monotonic() + STAMPEDE_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(STAMPEDE_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None and usable(entry):
+            return entry
+        if cache.get(_lock_key(key)) is None:
+            return None
+    return None
+
+
+def _rebuild(key, build, timeout):
+    started = time.monotonic()
+    value = build()
+    if value is None:
+        # Старая запись тоже больше не годится: страница стала 404 или
+        # её нельзя кэшировать.
+        cache.delete(key)
+    else:
+        entry = {
+            "value": value,
+            "expires": time.time() + timeout,
+            "delta": time.monotonic() - started,
+        }
+        # Запись живёт вдвое дольше срока, чтобы её было что отдать,
+        # пока один из процессов собирает новую.
+        cache.set(key, entry, timeout * 2)
+    return value
+
+
+def get_or_rebuild(key, build, timeout, is_valid=None, beta=STAMPEDE_BETA):
+    """Значение из кэша; пересобирает его не больше одного процесса.
+
+    build() возвращает новое значение или None, если кэшировать нечего.
+    Запись с истёкшим сроком пересобирает тот, кто взял блокировку через
+    cache.add, — остальные пока отдают старое значение. Запись, которую
+    отверг is_valid(), не отдаётся никому: как и при пустом кэше,
+    остальные ждут новую до STAMPEDE_WAIT_TIMEOUT и только потом
+    собирают сами.
+    """
+
+    def usable(entry):
+        return is_valid is None or is_valid(entry["value"])
+
+    entry = cache.get(key)
+    if entry is not None and not usable(entry):
+        entry = None
+    if entry is not None and not _expired(entry, time.time(), beta):
+        return entry["value"]
+    lock = _lock_key(key)
+    if not cache.add(lock, 1, STAMPEDE_LOCK_TIMEOUT):
+        if entry is None:
+            entry = _wait_for(key, usable)
+        if entry is not None:
+            return entry["value"]
+        return build()
+    try:
+        return _rebuild(key, build, timeout)
+    finally:
+        cache.delete(lock)
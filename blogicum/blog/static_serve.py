@@ -0,0 +1,187 @@
+import mimetypes
+import os
+import re
+
+from django.http import (
+    FileResponse,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils.cache import parse_etags
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.static import was_modified_since
+
+from blog.constants import (
+    STATIC_IMMUTABLE_MAX_AGE,
+    STATIC_MAX_AGE,
+    STATIC_RANGE_CHUNK_SIZE,
+)
+
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+RANGE = re.compile(r"bytes=(\d*)-(\d*)")
+# Имя, которое даёт ManifestStaticFilesStorage: «имя.<12 hex>.расширение».
+HASHED_NAME = re.compile(r"(.+)\.[0-9a-f]{12}(\.[^./]+)?")
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding, кроме явно запрещённых через q=0."""
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        name, _, quality = params.partition("=")
+        try:
+            if name.strip() == "q" and float(quality) == 0:
+                continue
+        except ValueError:
+            pass
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def choose_variant(path, accept_encoding):
+    """Путь к лучшему сжатому варианту файла и его кодировка."""
+    accepted = accepted_encodings(accept_encoding)
+    for encoding, suffix in ENCODINGS:
+        if (encoding in accepted or "*" in accepted) and os.path.isfile(
+            path + suffix
+        ):
+            return path + suffix, encoding
+    return path, None
+
+
+def parse_range(header, size):
+    """Границы (start, end) одного диапазона байт включительно.
+
+    None — заголовок не разобран или диапазонов несколько: тогда файл
+    отдаётся целиком. ValueError — диапазон за пределами файла.
+    """
+    match = RANGE.fullmatch(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def etag_matches(etag, header):
+    """Совпадает ли etag с If-None-Match: слабое сравнение, «*» и списки."""
+    etags = parse_etags(header)
+    if "*" in etags:
+        return True
+    return any(candidate.removeprefix("W/") == etag for candidate in etags)
+
+
+def if_range_matches(header, etag, mtime):
+    """Можно ли отдать диапазон при таком If-Range.
+
+    Без заголовка — можно. ETag сравнивается строго, дата — с точностью до
+    секунды с Last-Modified; при несовпадении файл отдаётся целиком.
+    """
+    if not header:
+        return True
+    header = header.strip()
+    if header.startswith(('"', "W/")):
+        return header == etag
+    return parse_http_date_safe(header) == int(mtime)
+
+
+def _read(path, start, length):
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        while length > 0:
+            chunk = fh.read(min(STATIC_RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def is_hashed_name(storage, name):
+    """Есть ли name в манифесте хранилища как имя с хэшем содержимого.
+
+    Манифест сверяется при каждом запросе: collectstatic мог обновить
+    его уже после запуска сервера.
+    """
+    match = HASHED_NAME.fullmatch(name)
+    if match is None:
+        return False
+    refresh = getattr(storage, "refresh_manifest", None)
+    if refresh is not None:
+        refresh()
+    original = match[1] + (match[2] or "")
+    return getattr(storage, "hashed_files", {}).get(original) == name
+
+
+def serve_static(request, path, immutable):
+    """Отдаёт файл STATIC_ROOT: сжатый вариант, кэширование и Range."""
+    variant, encoding = choose_variant(
+        path, request.META.get("HTTP_ACCEPT_ENCODING", "")
+    )
+    stat = os.stat(variant)
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}-{encoding or "id"}"'
+    content_type, _ = mimetypes.guess_type(path)
+    headers = {
+        "Content-Type": content_type or "application/octet-stream",
+        "Last-Modified": http_date(stat.st_mtime),
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Vary": "Accept-Encoding",
+        "Cache-Control": (
+            f"public, max-age={STATIC_IMMUTABLE_MAX_AGE}, immutable"
+            if immutable
+            else f"public, max-age={STATIC_MAX_AGE}"
+        ),
+    }
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if (if_none_match and etag_matches(etag, if_none_match)) or (
+        not if_none_match
+        and not was_modified_since(
+            request.META.get("HTTP_IF_MODIFIED_SINCE"),
+            stat.st_mtime,
+            stat.st_size,
+        )
+    ):
+        response = HttpResponseNotModified()
+        for name in ("ETag", "Last-Modified", "Vary", "Cache-Control"):
+            response[name] = headers[name]
+        return response
+
+    range_header = request.META.get("HTTP_RANGE", "")
+    if not if_range_matches(
+        request.META.get("HTTP_IF_RANGE"), etag, stat.st_mtime
+    ):
+        range_header = ""
+    try:
+        byte_range = parse_range(range_header, stat.st_size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{stat.st_size}"
+        return response
+    if byte_range is None:
+        response = FileResponse(open(variant, "rb"))
+        # FileResponse подставляет имя файла, а у сжатого варианта оно
+        # с суффиксом .gz/.br.
+        del response["Content-Disposition"]
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _read(variant, start, end - start + 1), status=206
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+        response["Content-Length"] = end - start + 1
+    for name, value in headers.items():
+        response[name] = value
+    return response
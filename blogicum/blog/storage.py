@@ -0,0 +1,109 @@
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+from blog.constants import (
+    STATIC_COMPRESSED_EXTENSIONS,
+    STATIC_MIN_COMPRESSION_RATIO,
+)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _gzip(data):
+    # mtime=0: одинаковые файлы дают одинаковый .gz при каждой сборке.
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data):
+    return brotli.compress(data, quality=11)
+
+
+def compressors():
+    """Пары (суффикс, функция); .br — только если установлен brotli."""
+    result = [(".gz", _gzip)]
+    if brotli is not None:
+        result.insert(0, (".br", _brotli))
+    return result
+
+
+def compress_file(path):
+    """Пишет рядом с файлом сжатые копии, если они заметно меньше.
+
+    Возвращает список созданных суффиксов.
+    """
+    with open(path, "rb") as fh:
+        data = fh.read()
+    written = []
+    for suffix, compress in compressors():
+        compressed = compress(data)
+        if len(compressed) < len(data) * STATIC_MIN_COMPRESSION_RATIO:
+            with open(path + suffix, "wb") as fh:
+                fh.write(compressed)
+            written.append(suffix)
+        elif os.path.exists(path + suffix):
+            # Копия от прошлой сборки файла с тем же именем устарела.
+            os.remove(path + suffix)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хэши в именах файлов и сжатые копии .gz/.br при collectstatic.
+
+    Пока collectstatic не запускали и манифеста нет, {% static %} отдаёт
+    исходные имена, как обычное хранилище, — файлы тогда берутся из
+    STATICFILES_DIRS.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._manifest_mtime = None
+        super().__init__(*args, **kwargs)
+
+    def load_manifest(self):
+        # Время изменения берётся до чтения: если файл перепишут между
+        # ними, refresh_manifest() прочитает его ещё раз.
+        try:
+            mtime = os.stat(self.path(self.manifest_name)).st_mtime_ns
+        except OSError:
+            mtime = None
+        hashed_files = super().load_manifest()
+        self._manifest_mtime = mtime
+        return hashed_files
+
+    def refresh_manifest(self):
+        """Перечитывает манифест, если его переписал другой процесс.
+
+        ManifestFilesMixin читает манифест один раз при создании
+        хранилища, а collectstatic обычно запускают отдельной командой
+        при работающем сервере.
+        """
+        try:
+            mtime = os.stat(self.path(self.manifest_name)).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._manifest_mtime:
+            return
+        try:
+            self.hashed_files = self.load_manifest()
+        except ValueError:
+            # collectstatic ещё пишет файл — прочитаем при следующем запросе.
+            pass
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        # Промежуточные хэши повторных проходов не сохраняются, поэтому
+        # сжимаются только итоговые имена из манифеста и исходные файлы.
+        for name in sorted({*paths, *self.hashed_files.values()}):
+            if os.path.splitext(name)[1] in STATIC_COMPRESSED_EXTENSIONS:
+                compress_file(self.path(name))
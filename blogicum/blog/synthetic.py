@@ -0,0 +1,204 @@
+import itertools
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post, User
+
+
+WORDS = (
+    "день", "город", "утро", "дорога", "море", "книга", "друг", "кофе",
+    "вечер", "горы", "работа", "снег", "лето", "история", "поезд", "кот",
+    "новость", "идея", "музыка", "ветер", "окно", "дом", "река", "лес",
+    "сегодня", "вчера", "снова", "очень", "почему", "наконец", "вместе",
+)
+
+
+def zipf_cum_weights(n, exponent=1.1):
+    """Накопленные веса закона Ципфа: k-й по активности — 1 / k^s."""
+    return list(
+        itertools.accumulate(1 / k**exponent for k in range(1, n + 1))
+    )
+
+
+def pareto_cum_weights(rng, n, alpha=1.2, allowed=None):
+    """Накопленные веса с тяжёлым хвостом: немногие получают почти всё.
+
+    Элементы, для которых allowed ложно, получают нулевой вес.
+    """
+    weights = (rng.paretovariate(alpha) for _ in range(n))
+    if allowed is not None:
+        weights = (
+            weight if ok else 0 for weight, ok in zip(weights, allowed)
+        )
+    return list(itertools.accumulate(weights))
+
+
+def next_pk(model):
+    return (model.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+
+
+def sentence(rng, low, high):
+    return " ".join(rng.choices(WORDS, k=rng.randint(low, high))).capitalize()
+
+
+def _bulk(model, objects, batch_size):
+    # Короткие транзакции: параллельные процессы пишут в SQLite по очереди.
+    for start in range(0, len(objects), batch_size):
+        with transaction.atomic():
+            model.objects.bulk_create(objects[start:start + batch_size])
+    return len(objects)
+
+
+@contextmanager
+def explicit_created_at(model):
+    """Даёт bulk_create сохранить заданный created_at.
+
+    С auto_now_add=True поле при вставке всегда получает текущее время,
+    даже если значение указано явно.
+    """
+    field = model._meta.get_field("created_at")
+    auto_now_add = field.auto_now_add
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = auto_now_add
+
+
+def create_users(rng, count, prefix, batch_size):
+    first = next_pk(User)
+    password = make_password(None)
+    users = [
+        User(
+            pk=pk,
+            username=f"{prefix}{pk}",
+            first_name=sentence(rng, 1, 1),
+            password=password,
+        )
+        for pk in range(first, first + count)
+    ]
+    _bulk(User, users, batch_size)
+    return range(first, first + count)
+
+
+def create_categories(rng, count, prefix, unpublished_share, batch_size):
+    first = next_pk(Category)
+    categories = [
+        Category(
+            pk=pk,
+            title=sentence(rng, 1, 3),
+            description=sentence(rng, 5, 15),
+            slug=f"{prefix}{pk}",
+            is_published=rng.random() >= unpublished_share,
+        )
+        for pk in range(first, first + count)
+    ]
+    _bulk(Category, categories, batch_size)
+    return range(first, first + count)
+
+
+def create_locations(rng, count, batch_size):
+    first = next_pk(Location)
+    locations = [
+        Location(pk=pk, name=sentence(rng, 1, 2))
+        for pk in range(first, first + count)
+    ]
+    _bulk(Location, locations, batch_size)
+    return range(first, first + count)
+
+
+def create_posts(
+    rng,
+    count,
+    user_ids,
+    category_ids,
+    location_ids,
+    future_share,
+    unpublished_share,
+    batch_size,
+):
+    """Публикации: авторы по Ципфу, часть отложена или снята.
+
+    Возвращает pk публикаций и их pub_date в том же порядке.
+    """
+    first = next_pk(Post)
+    now = timezone.now()
+    pub_dates = []
+    author_weights = zipf_cum_weights(len(user_ids))
+    for start in range(first, first + count, batch_size):
+        stop = min(start + batch_size, first + count)
+        authors = rng.choices(user_ids, cum_weights=author_weights,
+                              k=stop - start)
+        posts = []
+        for pk, author_id in zip(range(start, stop), authors):
+            if rng.random() < future_share:
+                pub_date = now + timedelta(
+                    minutes=rng.randint(1, 60 * 24 * 30)
+                )
+            else:
+                pub_date = now - timedelta(
+                    minutes=rng.randint(1, 60 * 24 * 730)
+                )
+            pub_dates.append(pub_date)
+            posts.append(
+                Post(
+                    pk=pk,
+                    title=sentence(rng, 2, 8),
+                    text=sentence(rng, 20, 120),
+                    pub_date=pub_date,
+                    author_id=author_id,
+                    category_id=rng.choice(category_ids),
+                    location_id=(
+                        rng.choice(location_ids)
+                        if location_ids and rng.random() < 0.8
+                        else None
+                    ),
+                    is_published=rng.random() >= unpublished_share,
+                )
+            )
+        _bulk(Post, posts, batch_size)
+    return range(first, first + count), pub_dates
+
+
+def create_comments(
+    seed,
+    index,
+    now,
+    count,
+    first_pk,
+    post_ids,
+    post_dates,
+    post_weights,
+    user_ids,
+    author_weights,
+    batch_size,
+):
+    """Порция комментариев, зависящая только от seed и index.
+
+    Поэтому результат одинаков при любом числе процессов. Комментарий
+    написан после pub_date своей публикации, но не позже now; у
+    отложенных публикаций в post_weights должен быть нулевой вес.
+    """
+    rng = random.Random(f"{seed}:comments:{index}")
+    posts = rng.choices(post_ids, cum_weights=post_weights, k=count)
+    authors = rng.choices(user_ids, cum_weights=author_weights, k=count)
+    comments = []
+    for offset, (post_id, author_id) in enumerate(zip(posts, authors)):
+        pub_date = post_dates[post_id - post_ids[0]]
+        comments.append(
+            Comment(
+                pk=first_pk + offset,
+                text=sentence(rng, 3, 40),
+                post_id=post_id,
+                author_id=author_id,
+                created_at=pub_date + (now - pub_date) * rng.random(),
+            )
+        )
+    with explicit_created_at(Comment):
+        return _bulk(Comment, comments, batch_size)
@@ -0,0 +1,18 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from blog.cards import attach_card_versions, render_post_card
+
+
+register = template.Library()
+
+
+@register.simple_tag
+def prime_post_cards(posts):
+    attach_card_versions(posts)
+    return ""
+
+
+@register.simple_tag
+def post_card(post):
+    return mark_safe(render_post_card(post))
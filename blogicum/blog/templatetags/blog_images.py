@@ -0,0 +1,44 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from blog.constants import IMAGE_SIZES
+from blog.images import MIME_TYPES, get_variants
+
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(image, css_class="", sizes=IMAGE_SIZES):
+    """<picture> с srcset из уменьшенных копий и ленивой загрузкой."""
+    width, variants = get_variants(image)
+    if not variants:
+        return format_html(
+            '<img class="{}" src="{}" loading="lazy" decoding="async">',
+            css_class,
+            image.url,
+        )
+    srcsets = {}
+    for variant_width, image_format, name in variants:
+        srcsets.setdefault(image_format, []).append(
+            f"{image.storage.url(name)} {variant_width}w"
+        )
+    *source_formats, fallback_format = srcsets
+    sources = format_html_join(
+        "",
+        '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (MIME_TYPES[image_format], ", ".join(srcsets[image_format]), sizes)
+            for image_format in source_formats
+        ),
+    )
+    fallback_srcset = srcsets[fallback_format] + [f"{image.url} {width}w"]
+    return format_html(
+        '<picture>{}<img class="{}" src="{}" srcset="{}" sizes="{}" '
+        'loading="lazy" decoding="async"></picture>',
+        sources,
+        css_class,
+        image.url,
+        ", ".join(fallback_srcset),
+        sizes,
+    )
@@ -0,0 +1,127 @@
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import Template
+
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar("blog_request_timings", default=None)
+
+
+class RequestTimings:
+    """Замеры одного запроса: SQL, шаблоны и время целиком (секунды)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view = ""
+        self.queries = 0
+        self.db = 0.0
+        self.templates = 0.0
+        self.total = 0.0
+        self.template_depth = 0
+
+    def finish(self):
+        self.total = time.perf_counter() - self.started
+
+    def server_timing(self):
+        return ", ".join(
+            (
+                f'db;dur={self.db * 1000:.1f};desc="{self.queries} SQL"',
+                f"tpl;dur={self.templates * 1000:.1f}",
+                f"total;dur={self.total * 1000:.1f}",
+            )
+        )
+
+    def as_dict(self):
+        return {
+            "view": self.view,
+            "queries": self.queries,
+            "db_ms": round(self.db * 1000, 1),
+            "template_ms": round(self.templates * 1000, 1),
+            "total_ms": round(self.total * 1000, 1),
+        }
+
+
+def current_timings():
+    return _current.get()
+
+
+@contextmanager
+def measure_request():
+    """Замеры текущего запроса; если их уже ведёт внешний код, те же."""
+    timings = _current.get()
+    if timings is not None:
+        yield timings
+        return
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(record_query))
+            yield timings
+        timings.finish()
+    finally:
+        _current.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    """Обёртка для connection.execute_wrapper()."""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        timings.queries += 1
+        timings.db += elapsed
+        threshold = getattr(settings, "BLOG_SLOW_QUERY_MS", 200)
+        if elapsed * 1000 >= threshold:
+            logger.warning(
+                "slow query %.1f ms in %s: %s",
+                elapsed * 1000,
+                timings.view,
+                sql,
+                extra={
+                    "view": timings.view,
+                    "duration_ms": round(elapsed * 1000, 1),
+                    "sql": sql,
+                },
+            )
+
+
+def instrument_templates():
+    """Один раз оборачивает render() шаблонов движка Django.
+
+    TemplateResponse отрисовывается уже после возврата из view, поэтому
+    время шаблонов нельзя снять в process_view; вне замеряемого запроса
+    обёртка сразу вызывает исходный метод. Вложенные отрисовки (карточки
+    из шаблонного тега) входят во время внешней и не считаются дважды.
+    """
+    if getattr(Template.render, "blog_timed", False):
+        return
+    render = Template.render
+
+    @wraps(render)
+    def timed_render(self, *args, **kwargs):
+        timings = _current.get()
+        if timings is None or timings.template_depth:
+            return render(self, *args, **kwargs)
+        started = time.perf_counter()
+        timings.template_depth += 1
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            timings.template_depth -= 1
+            timings.templates += time.perf_counter() - started
+
+    timed_render.blog_timed = True
+    Template.render = timed_render
@@ -16,11 +16,31 @@ urlpatterns = [
         views.PostDetailView.as_view(),
         name="post_detail",
     ),
+    path(
+        "posts/<int:post_id>/comments/",
+        views.post_comments,
+        name="post_comments",
+    ),
     path(
         "category/<slug:category_slug>/",
         views.category_posts,
         name="category_posts",
     ),
+    path(
+        "search/",
+        views.search,
+        name="search",
+    ),
+    path(
+        "export/",
+        views.export,
+        name="export",
+    ),
+    path(
+        "metrics",
+        views.metrics,
+        name="metrics",
+    ),
     path(
         "posts/create/",
         views.PostCreateView.as_view(),
@@ -0,0 +1,93 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Case, F, PositiveBigIntegerField, Value, When
+
+from blog.constants import VIEW_COUNTER_BATCH_SIZE
+from blog.models import Post
+
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """Буфер просмотров публикаций с отложенной записью в Post.views.
+
+    Просмотры копятся в памяти процесса, а фоновый поток раз в
+    BLOG_VIEW_COUNTER_FLUSH_INTERVAL секунд пишет их пачками — одним
+    UPDATE ... CASE на VIEW_COUNTER_BATCH_SIZE публикаций. При остановке
+    процесса буфер сбрасывается через atexit, так что при падении
+    теряется не больше одного интервала.
+    """
+
+    def __init__(self, batch_size=VIEW_COUNTER_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def interval(self):
+        return getattr(settings, "BLOG_VIEW_COUNTER_FLUSH_INTERVAL", 10)
+
+    def increment(self, post_id, n=1):
+        with self._lock:
+            self._pending[post_id] += n
+            if self._thread is None and self.interval > 0:
+                self._start()
+
+    def pending(self, post_id):
+        with self._lock:
+            return self._pending[post_id]
+
+    def flush(self):
+        """Пишет накопленные просмотры в базу; возвращает их число."""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        items = list(pending.items())
+        flushed = 0
+        try:
+            for start in range(0, len(items), self.batch_size):
+                batch = dict(items[start:start + self.batch_size])
+                self._write(batch)
+                flushed += sum(batch.values())
+                for post_id in batch:
+                    del pending[post_id]
+        finally:
+            if pending:
+                with self._lock:
+                    self._pending.update(pending)
+        return flushed
+
+    def _write(self, batch):
+        increment = Case(
+            *(When(pk=pk, then=Value(n)) for pk, n in batch.items()),
+            default=Value(0),
+            output_field=PositiveBigIntegerField(),
+        )
+        Post.objects.filter(pk__in=batch).update(views=F("views") + increment)
+
+    def _start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="blog-view-counter", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Не удалось записать просмотры публикаций")
+            finally:
+                close_old_connections()
+
+
+post_views = ViewCounter()
@@ -1,8 +1,16 @@
-import pytz
-from datetime import datetime
+from functools import wraps
+from urllib.parse import urlencode
 
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import Http404
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy
 from django.contrib.auth import get_user_model
 from django.views.generic import (
@@ -12,38 +20,95 @@ from django.views.generic import (
     ListView,
     DeleteView,
 )
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.paginator import Paginator
 from django.core.exceptions import PermissionDenied
-from django.db.models import Count
-
-from blog.models import Category, Post, Comment
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+from blog.conditional import (
+    category_etag,
+    feed_etag,
+    post_etag,
+    profile_etag,
+)
+from blog.cache_tags import FEED, tag_key
+from blog.models import Category, Post, Comment, OutboxEmail
+from blog.export import FORMATS, iter_export
 from blog.forms import PostForm, CommentForm
-from blog.mixins import PostDispatchMixin
-from blog.constants import POSTS_PER_PAGE
+from blog.mixins import AuthorObjectMixin, PostDispatchMixin
+from blog.constants import (
+    COMMENTS_PER_PAGE,
+    OUTBOX_MAX_ATTEMPTS,
+    POSTS_PER_PAGE,
+)
+from blog.images import variant_backlog
+from blog.metrics import collect, render as render_metrics
+from blog.page_cache import cache_anonymous_page, tag_page
+from blog.paginators import (
+    CachedCountPaginator,
+    CursorPaginator,
+    ElidedPaginator,
+)
+from blog.search import search_posts
+from blog.view_counts import post_views
+from blog.visibility import is_post_visible
 
 
 User = get_user_model()
-NOW = pytz.utc.localize(datetime.now())
 
 
+def cursor_pagination_enabled():
+    return getattr(settings, "BLOG_CURSOR_PAGINATION", False)
+
+
+def paginate_posts(request, queryset):
+    if cursor_pagination_enabled():
+        paginator = CursorPaginator(queryset, POSTS_PER_PAGE)
+        return paginator.get_page(request.GET.get("cursor"))
+    paginator = CachedCountPaginator(queryset, POSTS_PER_PAGE)
+    return paginator.get_page(request.GET.get("page"))
+
+
+def paginate_comments(post, cursor):
+    comments = post.comments.select_related("author").only(
+        "text", "created_at", "post_id", "author__username"
+    )
+    paginator = CursorPaginator(
+        comments, COMMENTS_PER_PAGE, field="created_at", descending=False
+    )
+    return paginator.get_page(cursor)
+
+
+def get_visible_post(request, post_id):
+    post = get_object_or_404(Post, pk=post_id)
+    if not is_post_visible(post, request.user):
+        raise Http404
+    return post
+
+
+@method_decorator(condition(etag_func=feed_etag), name="dispatch")
+@method_decorator(cache_anonymous_page, name="dispatch")
 class PostListView(ListView):
     model = Post
     template_name = "blog/index.html"
     context_object_name = "posts"
     paginate_by = POSTS_PER_PAGE
+    paginator_class = CachedCountPaginator
 
     def get_queryset(self):
-        queryset = (
-            Post.objects.filter(
-                is_published=True,
-                category__is_published=True,
-                pub_date__lte=NOW,
-            )
-            .annotate(comment_count=Count("comments"))
-            .order_by("-pub_date")
-        )
-        return queryset
+        return Post.objects.published().for_feed()
+
+    def paginate_queryset(self, queryset, page_size):
+        if not cursor_pagination_enabled():
+            return super().paginate_queryset(queryset, page_size)
+        page = paginate_posts(self.request, queryset)
+        return page.paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        tag_page(self.request, context["page_obj"], tag_key(FEED))
+        return context
 
 
 class PostCreateView(LoginRequiredMixin, CreateView):
@@ -78,44 +143,96 @@ class PostDeleteView(PostDispatchMixin, LoginRequiredMixin, DeleteView):
     template_name = "blog/create.html"
     pk_url_kwarg = "post_id"
     success_url = reverse_lazy("blog:index")
+    # Без only(): обработчики post_delete читают поля удалённой публикации,
+    # и отложенное поле пришло бы в них как None.
+    related_fields = ("location",)
+
+
+def count_revalidated_views(view):
+    """Засчитывает просмотр, на который condition() ответил 304.
 
+    Отрисованная страница засчитывается в get_context_data(), а до неё
+    ответ 304 не доходит.
+    """
 
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if response.status_code == 304:
+            post_views.increment(kwargs["post_id"])
+        return response
+
+    return wrapper
+
+
+@method_decorator(count_revalidated_views, name="dispatch")
+@method_decorator(condition(etag_func=post_etag), name="dispatch")
 class PostDetailView(LoginRequiredMixin, DetailView):
     model = Post
     pk_url_kwarg = "post_id"
     template_name = "blog/detail.html"
 
     def get_object(self, queryset=None):
-        post = get_object_or_404(Post, pk=self.kwargs.get("post_id"))
-        if post.author != self.request.user:
-            if any(
-                [
-                    post.pub_date > NOW,
-                    not post.is_published,
-                    not post.category.is_published,
-                ]
-            ):
-                raise Http404
-        return post
+        # Публикацию уже загрузил и проверил post_etag().
+        post = getattr(self.request, "visible_post", None)
+        if post is not None:
+            return post
+        return get_visible_post(self.request, self.kwargs.get("post_id"))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        post_views.increment(self.object.pk)
+        context["views"] = self.object.views + post_views.pending(
+            self.object.pk
+        )
         context["form"] = CommentForm()
-        context["comments"] = self.object.comments.select_related("author")
+        context["comments"] = paginate_comments(
+            self.object, self.request.GET.get("comments")
+        )
         return context
 
 
+@login_required
+def post_comments(request, post_id):
+    post = get_visible_post(request, post_id)
+    comments = paginate_comments(post, request.GET.get("cursor"))
+    context = {"post": post, "comments": comments}
+    if request.GET.get("format") != "json":
+        return render(request, "includes/comment_list.html", context)
+    return JsonResponse(
+        {
+            "comments": [
+                {
+                    "id": comment.pk,
+                    "author": comment.author.username,
+                    "text": comment.text,
+                    "created_at": comment.created_at.isoformat(),
+                }
+                for comment in comments
+            ],
+            "next_cursor": comments.next_cursor,
+            "html": render_to_string(
+                "includes/comment_list.html", context, request=request
+            ),
+        }
+    )
+
+
+@condition(etag_func=profile_etag)
+@cache_anonymous_page
 def user_profile(request, username):
     profile = get_object_or_404(User, username=username)
-    posts = profile.posts.annotate(comment_count=Count("comments")).order_by(
-        "-pub_date"
-    )
-    paginator = Paginator(posts, POSTS_PER_PAGE)
-    page_obj = paginator.get_page(request.GET.get("page"))
+    posts = profile.posts.for_feed()
     context = {
-        "page_obj": page_obj,
+        "page_obj": paginate_posts(request, posts),
         "profile": profile,
     }
+    tag_page(
+        request,
+        context["page_obj"],
+        tag_key("user", profile.pk),
+        tag_key("author-feed", profile.pk),
+    )
     return render(request, "blog/profile.html", context)
 
 
@@ -141,7 +258,9 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
     template_name = "blog/comment.html"
 
     def dispatch(self, request, *args, **kwargs):
-        self.post_instance = get_object_or_404(Post, pk=kwargs.get("post_id"))
+        self.post_instance = get_object_or_404(
+            Post.objects.only("pk"), pk=kwargs.get("post_id")
+        )
         return super().dispatch(request, *args, **kwargs)
 
     def form_valid(self, form):
@@ -155,15 +274,15 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
         )
 
 
-class CommentUpdateView(LoginRequiredMixin, UpdateView):
+class CommentUpdateView(AuthorObjectMixin, LoginRequiredMixin, UpdateView):
     model = Comment
     form_class = CommentForm
     template_name = "blog/comment.html"
     pk_url_kwarg = "comment_id"
+    only_fields = ("text", "post", "author")
 
     def dispatch(self, request, *args, **kwargs):
-        instance = get_object_or_404(Comment, pk=kwargs.get("comment_id"))
-        if request.user != instance.author:
+        if not self.is_author():
             return redirect("blog:post_detail", self.kwargs.get("post_id"))
         return super().dispatch(request, *args, **kwargs)
 
@@ -173,14 +292,14 @@ class CommentUpdateView(LoginRequiredMixin, UpdateView):
         )
 
 
-class CommentDeleteView(LoginRequiredMixin, DeleteView):
+class CommentDeleteView(AuthorObjectMixin, LoginRequiredMixin, DeleteView):
     model = Comment
     pk_url_kwarg = "comment_id"
     template_name = "blog/comment.html"
+    only_fields = ("text", "post", "author")
 
     def dispatch(self, request, *args, **kwargs):
-        comment = get_object_or_404(Comment, pk=kwargs.get("comment_id"))
-        if self.request.user != comment.author:
+        if not self.is_author():
             raise PermissionDenied
         return super().dispatch(request, *args, **kwargs)
 
@@ -190,19 +309,76 @@ class CommentDeleteView(LoginRequiredMixin, DeleteView):
         )
 
 
+@condition(etag_func=category_etag)
+@cache_anonymous_page
 def category_posts(request, category_slug):
     category = get_object_or_404(Category, slug=category_slug)
     if not category.is_published:
         raise Http404
-    post_list = Post.objects.filter(
-        category=category,
-        is_published=True,
-        pub_date__lte=NOW,
-    ).order_by("-pub_date")
-    paginator = Paginator(post_list, POSTS_PER_PAGE)
-    page_obj = paginator.get_page(request.GET.get("page"))
+    post_list = category.posts.published().for_feed()
     context = {
         "category": category,
-        "page_obj": page_obj,
+        "page_obj": paginate_posts(request, post_list),
     }
+    tag_page(
+        request,
+        context["page_obj"],
+        tag_key("category", category.pk),
+        tag_key("category-feed", category.pk),
+    )
     return render(request, "blog/category.html", context)
+
+
+def search(request):
+    query = request.GET.get("q", "").strip()
+    posts = search_posts(Post.objects.published().for_feed(), query)
+    paginator = ElidedPaginator(posts, POSTS_PER_PAGE)
+    context = {
+        "query": query,
+        "page_obj": paginator.get_page(request.GET.get("page")),
+        "page_query": urlencode({"q": query}) + "&",
+    }
+    return render(request, "blog/search.html", context)
+
+
+@login_required
+def export(request):
+    if not request.user.is_staff:
+        raise PermissionDenied
+    kind = request.GET.get("kind", "posts")
+    fmt = request.GET.get("format", "jsonl")
+    try:
+        chunks = iter_export(
+            kind,
+            fmt,
+            category=request.GET.get("category"),
+            author=request.GET.get("author"),
+            since=request.GET.get("since"),
+            until=request.GET.get("until"),
+        )
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    response = StreamingHttpResponse(
+        chunks, content_type=f"{FORMATS[fmt]}; charset=utf-8"
+    )
+    response["Content-Disposition"] = f'attachment; filename="{kind}.{fmt}"'
+    return response
+
+
+def metrics(request):
+    if not getattr(settings, "BLOG_METRICS", False):
+        raise Http404
+    allowed = getattr(settings, "BLOG_METRICS_ALLOWED_IPS", ["127.0.0.1"])
+    if request.META.get("REMOTE_ADDR") not in allowed:
+        raise PermissionDenied
+    counters, histograms = collect()
+    gauges = {
+        "blog_outbox_pending": OutboxEmail.objects.filter(
+            sent_at__isnull=True, attempts__lt=OUTBOX_MAX_ATTEMPTS
+        ).count(),
+        "blog_image_variant_backlog": variant_backlog(),
+    }
+    return HttpResponse(
+        render_metrics(counters, histograms, gauges),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.utils import timezone
+
+
+def visibility_now():
+    """Текущее время, округлённое вниз до BLOG_VISIBILITY_BUCKET секунд.
+
+    Внутри одного интервала запросы лент и ключи кэша совпадают, а
+    отложенная публикация появляется не позже чем через один интервал.
+    """
+    now = timezone.now()
+    bucket = int(getattr(settings, "BLOG_VISIBILITY_BUCKET", 60))
+    if bucket <= 1:
+        return now
+    rounded = int(now.timestamp()) // bucket * bucket
+    return datetime.fromtimestamp(rounded, tz=timezone.utc)
+
+
+def is_post_visible(post, user, now=None):
+    if post.author_id == user.pk:
+        return True
+    return (
+        post.is_published
+        and post.pub_date <= (now or visibility_now())
+        and post.category is not None
+        and post.category.is_published
+    )
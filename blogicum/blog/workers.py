@@ -0,0 +1,16 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import connections
+
+
+def process_pool(processes, initializer=None, initargs=()):
+    """Пул процессов для management-команд, работающих с БД.
+
+    Соединения закрываются до запуска пула: дочерний процесс, получивший
+    открытый сокет или файл SQLite родителя при fork, испортил бы его
+    состояние. Каждый процесс откроет своё соединение при первом запросе.
+    """
+    connections.close_all()
+    return ProcessPoolExecutor(
+        processes, initializer=initializer, initargs=initargs
+    )
@@ -33,13 +33,17 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "blog.middleware.RequestTimingMiddleware",
+    "blog.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "blog.middleware.StaticFilesMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "blog.middleware.ReadReplicaMiddleware",
 ]
 
 ROOT_URLCONF = "blogicum.urls"
@@ -76,6 +80,21 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+# Общий для всех процессов сервера кэш: сигналы, management-команды и
+# отправка писем сбрасывают теги кэша только в своём процессе, а у
+# LocMemCache он у каждого процесса свой
+CACHES = {
+    "default": {
+        "BACKEND": "blog.cache_backends.FileBasedCache",
+        "LOCATION": BASE_DIR / "cache",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -116,6 +135,8 @@ STATIC_URL = "/static/"
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
+STATIC_ROOT = BASE_DIR / "staticfiles"
+STATICFILES_STORAGE = "blog.storage.CompressedManifestStaticFilesStorage"
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
@@ -134,3 +155,61 @@ LOGIN_REDIRECT_URL = "blog:index"
 
 EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
 EMAIL_FILE_PATH = BASE_DIR / "sent_emails"
+
+# Keyset-пагинация лент по (pub_date, id) вместо номеров страниц
+BLOG_CURSOR_PAGINATION = False
+
+# Шаг (в секундах), до которого округляется «сейчас» при отборе публикаций
+BLOG_VISIBILITY_BUCKET = 60
+
+# Создавать уменьшенные копии картинок при сохранении публикации;
+# иначе они создаются при первом показе карточки
+BLOG_IMAGE_VARIANTS_ON_SAVE = True
+
+# Кэшировать ленты, категории и профили целиком для анонимных посетителей
+BLOG_PAGE_CACHE = True
+
+# PRAGMA для каждого соединения с SQLite: в режиме WAL писатели не блокируют
+# читателей, а busy_timeout (мс) ждёт блокировку вместо «database is locked»
+BLOG_SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "mmap_size": 128 * 1024 * 1024,
+    "cache_size": -20000,
+    "temp_store": "MEMORY",
+}
+
+DATABASE_ROUTERS = ["blog.routers.ReadReplicaRouter"]
+
+# Псевдонимы из DATABASES с копиями основной базы только для чтения;
+# копии обновляет manage.py sync_replicas
+BLOG_READ_REPLICAS = []
+
+# Сколько секунд после записи запросы пользователя читают из основной базы
+BLOG_PRIMARY_PIN_SECONDS = 10
+
+# Как часто (в секундах) фоновый поток пишет накопленные просмотры
+# публикаций в базу; 0 — только по явному вызову post_views.flush()
+BLOG_VIEW_COUNTER_FLUSH_INTERVAL = 10
+
+# Замерять запросы: Server-Timing и строка в лог blog.timing; выключенная
+# middleware не добавляет накладных расходов
+BLOG_REQUEST_TIMING = False
+
+# Запросы к базе дольше этого порога (мс) логируются с SQL и именем view
+BLOG_SLOW_QUERY_MS = 200
+
+# Отдавать метрики Prometheus на /metrics и собирать их в middleware
+BLOG_METRICS = False
+
+# Адреса, которым доступен /metrics
+BLOG_METRICS_ALLOWED_IPS = ["127.0.0.1"]
+
+# Общий каталог, через который метрики суммируются по всем процессам
+# сервера (gunicorn и т. п.); None — только текущий процесс
+BLOG_METRICS_DIR = None
+
+# Отдавать статику из STATIC_ROOT (после manage.py collectstatic) сжатой и
+# с долгим кэшированием, без nginx
+BLOG_SERVE_STATIC = True
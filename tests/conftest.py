@@ -26,12 +26,51 @@ UrlRepr = NamedTuple('UrlRepr', [('url', str), ('repr', str)])
 TitledUrlRepr = TypeVar('TitledUrlRepr', bound=Tuple[UrlRepr, str])
 
 
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmark', 'бенчмарки страниц блога')
+    group.addoption('--benchmark', action='store_true',
+                    help='запустить замеры скорости')
+    group.addoption('--bench-users', type=int, default=20)
+    group.addoption('--bench-categories', type=int, default=5)
+    group.addoption('--bench-posts', type=int, default=300)
+    group.addoption('--bench-comments', type=int, default=1000)
+    group.addoption('--bench-requests', type=int, default=50,
+                    help='число замеряемых запросов на страницу')
+    group.addoption('--bench-budgets', default=None,
+                    help='JSON-файл с бюджетами страниц')
+    group.addoption('--bench-report', default=None,
+                    help='куда записать результаты замеров в JSON')
+
+
+@pytest.fixture
+def benchmark_only(request):
+    if not request.config.getoption('--benchmark'):
+        pytest.skip('замеры времени запускаются с флагом --benchmark')
+
+
+@pytest.fixture(scope='session', autouse=True)
+def shared_cache_dir(tmp_path_factory):
+    location = tmp_path_factory.mktemp('cache')
+    with override_settings(CACHES={'default': {
+        'BACKEND': 'blog.cache_backends.FileBasedCache',
+        'LOCATION': location,
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }}):
+        yield location
+
+
 @pytest.fixture(autouse=True)
 def enable_debug_false():
     with override_settings(DEBUG=False):
         yield
 
 
+@pytest.fixture(autouse=True)
+def flush_post_views_manually():
+    with override_settings(BLOG_VIEW_COUNTER_FLUSH_INTERVAL=0):
+        yield
+
+
 class SafeImportFromContextManager:
 
     def __init__(self, import_path: str,
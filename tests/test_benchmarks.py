@@ -0,0 +1,160 @@
+"""Замеры скорости страниц блога с бюджетами на запросы к БД и задержку.
+
+Запускаются только с флагом ``--benchmark``::
+
+    pytest tests/test_benchmarks.py --benchmark --bench-posts 5000
+
+Размер базы задаётся опциями ``--bench-*`` (см. ``tests/conftest.py``),
+бюджеты — файлом ``tests/benchmark_budgets.json`` или ``--bench-budgets``.
+"""
+import json
+import random
+import statistics
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import connection, reset_queries
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from mixer.backend.django import mixer as _mixer
+
+DEFAULT_BUDGETS = Path(__file__).parent / 'benchmark_budgets.json'
+WARMUP_REQUESTS = 3
+BENCHMARKED_VIEWS = (
+    'blog:index', 'blog:post_detail', 'blog:category_posts', 'blog:profile')
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def endless(factory):
+    while True:
+        yield factory()
+
+
+@pytest.fixture(scope='module')
+def bench_config(request):
+    if not request.config.getoption('--benchmark'):
+        pytest.skip('бенчмарки запускаются с флагом --benchmark')
+    return request.config
+
+
+@pytest.fixture(scope='module')
+def bench_data(bench_config, django_db_setup, django_db_blocker):
+    option = bench_config.getoption
+    rng = random.Random(0)
+    past = endless(lambda: timezone.now() - timedelta(
+        minutes=rng.randint(5, 60 * 24 * 365)))
+    with django_db_blocker.unblock():
+        users = _mixer.cycle(option('--bench-users')).blend(
+            get_user_model())
+        categories = _mixer.cycle(option('--bench-categories')).blend(
+            'blog.Category', is_published=True)
+        locations = _mixer.cycle(option('--bench-categories')).blend(
+            'blog.Location', is_published=True)
+        posts = _mixer.cycle(option('--bench-posts')).blend(
+            'blog.Post', is_published=True, image=None, pub_date=past,
+            author=endless(lambda: rng.choice(users)),
+            category=endless(lambda: rng.choice(categories)),
+            location=endless(lambda: rng.choice(locations)))
+        _mixer.cycle(option('--bench-comments')).blend(
+            'blog.Comment',
+            author=endless(lambda: rng.choice(users)),
+            post=endless(lambda: rng.choice(posts)))
+        top_post = max(posts, key=lambda post: post.comments.count())
+        yield {
+            'user': users[0],
+            'urls': {
+                'blog:index': reverse('blog:index'),
+                'blog:post_detail': reverse(
+                    'blog:post_detail', args=(top_post.pk,)),
+                'blog:category_posts': reverse(
+                    'blog:category_posts', args=(categories[0].slug,)),
+                'blog:profile': reverse(
+                    'blog:profile', args=(top_post.author.username,)),
+            },
+        }
+        get_user_model().objects.all().delete()
+        for model_name in ('blog.Category', 'blog.Location'):
+            apps.get_model(model_name).objects.all().delete()
+
+
+@pytest.fixture(scope='module')
+def budgets(bench_config):
+    path = bench_config.getoption('--bench-budgets') or DEFAULT_BUDGETS
+    with open(path, encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+@pytest.fixture(scope='module')
+def report(bench_config):
+    results = {}
+    yield results
+    path = bench_config.getoption('--bench-report')
+    if path:
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(results, fh, ensure_ascii=False, indent=2)
+
+
+def percentile(samples, share):
+    ordered = sorted(samples)
+    index = max(0, round(share * len(ordered) + 0.5) - 1)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def measure(client, url, n_requests):
+    for _ in range(WARMUP_REQUESTS):
+        assert client.get(url).status_code == 200
+    # Журнал запросов очищается в начале каждого запроса (request_started),
+    # поэтому он сбрасывается до замера и читается сразу после него.
+    reset_queries()
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(url)
+    n_queries = len(ctx.captured_queries)
+    timings = []
+    started = time.perf_counter()
+    for _ in range(n_requests):
+        request_started = time.perf_counter()
+        client.get(url)
+        timings.append(time.perf_counter() - request_started)
+    total = time.perf_counter() - started
+    return {
+        'queries': n_queries,
+        'rps': n_requests / total,
+        'p50_ms': percentile(timings, 0.5) * 1000,
+        'p99_ms': percentile(timings, 0.99) * 1000,
+        'mean_ms': statistics.mean(timings) * 1000,
+    }
+
+
+@pytest.mark.parametrize('view_name', BENCHMARKED_VIEWS)
+def test_view_budget(bench_config, bench_data, budgets, report, view_name):
+    client = Client()
+    client.force_login(bench_data['user'])
+    result = measure(client, bench_data['urls'][view_name],
+                     bench_config.getoption('--bench-requests'))
+    report[view_name] = result
+    print(
+        f'\n{view_name}: {result["rps"]:.0f} rps, '
+        f'p50 {result["p50_ms"]:.1f} мс, p99 {result["p99_ms"]:.1f} мс, '
+        f'запросов к БД: {result["queries"]}'
+    )
+
+    budget = budgets.get(view_name, {})
+    if 'max_queries' in budget:
+        assert result['queries'] <= budget['max_queries'], (
+            f'Страница {view_name} делает {result["queries"]} запросов к БД '
+            f'при бюджете {budget["max_queries"]}.'
+        )
+    if 'p99_ms' in budget:
+        assert result['p99_ms'] <= budget['p99_ms'], (
+            f'p99 страницы {view_name} — {result["p99_ms"]:.1f} мс '
+            f'при бюджете {budget["p99_ms"]} мс.'
+        )
@@ -0,0 +1,74 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from blog.bulk_load import iter_json_array
+from blog.models import Category, Comment, Post
+
+DB_JSON = Path(__file__).resolve().parent.parent / 'db.json'
+
+
+def _load(*args):
+    out = io.StringIO()
+    call_command('bulk_load', *args, stdout=out)
+    return out.getvalue()
+
+
+def test_iter_json_array_streams_objects():
+    expected = json.loads(DB_JSON.read_text(encoding='utf-8'))
+    with open(DB_JSON, encoding='utf-8') as fh:
+        streamed = list(iter_json_array(fh, chunk_size=100))
+    assert streamed == expected, (
+        'Убедитесь, что потоковый разбор JSON-массива отдаёт те же объекты, '
+        'что и json.load.'
+    )
+    assert list(iter_json_array(io.StringIO(' [ ] '))) == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bulk_load_db_json_with_deferred_indexes():
+    output = _load(str(DB_JSON), '--batch-size', '7', '--defer-indexes')
+    assert Post.objects.count() == 39
+    assert Category.objects.count() == 6
+    assert 'строк/с' in output, (
+        'Убедитесь, что команда bulk_load сообщает скорость загрузки.'
+    )
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, Post._meta.db_table)
+    assert {index.name for index in Post._meta.indexes} <= set(constraints), (
+        'Убедитесь, что после загрузки с --defer-indexes индексы '
+        'созданы заново.'
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_load_json_lines_recounts_comments(tmp_path, user):
+    rows = [
+        {'model': 'blog.category', 'pk': 1, 'fields': {
+            'title': 'Категория', 'description': 'Описание',
+            'slug': 'cat', 'is_published': True,
+            'created_at': '2023-01-01T00:00:00Z'}},
+        {'model': 'blog.post', 'pk': 1, 'fields': {
+            'title': 'Публикация', 'text': 'Текст', 'author': user.pk,
+            'category': 1, 'pub_date': '2023-01-01T00:00:00Z',
+            'is_published': True, 'created_at': '2023-01-01T00:00:00Z'}},
+    ] + [
+        {'model': 'blog.comment', 'pk': pk, 'fields': {
+            'text': f'Комментарий {pk}', 'post': 1, 'author': user.pk,
+            'created_at': '2023-01-02T00:00:00Z'}}
+        for pk in range(1, 6)
+    ]
+    path = tmp_path / 'dump.jsonl'
+    path.write_text('\n'.join(json.dumps(row) for row in rows),
+                    encoding='utf-8')
+    _load(str(path), '--batch-size', '2')
+    assert Comment.objects.count() == 5
+    assert Post.objects.get(pk=1).comment_count == 5, (
+        'Убедитесь, что после загрузки bulk_load пересчитывает '
+        'Post.comment_count.'
+    )
@@ -0,0 +1,102 @@
+import time
+
+import pytest
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from mixer.backend.django import Mixer
+
+from blog.cards import attach_card_versions
+from blog.models import Post
+from conftest import N_PER_PAGE
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def feed(mixer: Mixer, user, published_category, published_location):
+    cache.clear()
+    return mixer.cycle(N_PER_PAGE).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location, is_published=True)
+
+
+def _index(client):
+    return client.get('/').content.decode()
+
+
+@pytest.mark.parametrize('change', ['post', 'author', 'category',
+                                    'location', 'comment'])
+def test_card_cache_invalidation(
+        mixer: Mixer, user_client, feed, change):
+    post = feed[0]
+    _index(user_client)
+    if change == 'post':
+        post.title = 'Новый заголовок'
+        post.save()
+        expected = 'Новый заголовок'
+    elif change == 'author':
+        post.author.username = 'renamed_author'
+        post.author.save(update_fields=['username'])
+        expected = '@renamed_author'
+    elif change == 'category':
+        post.category.title = 'Новая категория'
+        post.category.save()
+        expected = 'Новая категория'
+    elif change == 'location':
+        post.location.name = 'Новое место'
+        post.location.save()
+        expected = 'Новое место'
+    else:
+        mixer.blend('blog.Comment', post=post)
+        expected = 'Комментарии (1)'
+    assert expected in _index(user_client), (
+        'Убедитесь, что кэш карточек публикаций сбрасывается '
+        f'при изменении связанного объекта ({change}).'
+    )
+
+
+def test_warm_card_cache_skips_rendering(feed, monkeypatch):
+    posts = list(Post.objects.published().for_feed()[:N_PER_PAGE])
+    rendered = []
+
+    def counting_render(template_name, context=None, *args, **kwargs):
+        rendered.append(context['post'].pk)
+        return render_to_string(template_name, context, *args, **kwargs)
+
+    monkeypatch.setattr('blog.cards.render_to_string', counting_render)
+    attach_card_versions(posts)
+    render_to_string('blog/index.html', {'page_obj': posts})
+    assert len(rendered) == len(posts)
+    rendered.clear()
+    attach_card_versions(posts)
+    render_to_string('blog/index.html', {'page_obj': posts})
+    assert rendered == [], (
+        'Убедитесь, что при прогретом кэше карточки не отрисовываются заново.'
+    )
+
+
+def test_card_cache_benchmark(feed, benchmark_only):
+    posts = list(Post.objects.published().for_feed()[:N_PER_PAGE])
+    rounds = 20
+
+    def render():
+        attach_card_versions(posts)
+        return render_to_string('blog/index.html', {'page_obj': posts})
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        cache.clear()
+        render()
+    cold = (time.perf_counter() - started) / rounds
+
+    render()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        render()
+    warm = (time.perf_counter() - started) / rounds
+    assert warm < cold, (
+        f'Прогретый кэш карточек ({warm * 1000:.2f} мс на страницу) не '
+        f'быстрее холодного ({cold * 1000:.2f} мс).'
+    )
@@ -0,0 +1,47 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from mixer.backend.django import Mixer
+
+from blog.models import Comment, Post
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def _count(post):
+    return Post.objects.values_list('comment_count', flat=True).get(
+        pk=post.pk)
+
+
+def test_comment_count_follows_comments(
+        mixer: Mixer, post_with_published_location):
+    post = post_with_published_location
+    assert _count(post) == 0
+    comments = mixer.cycle(3).blend('blog.Comment', post=post)
+    assert _count(post) == 3, (
+        'Убедитесь, что счётчик комментариев увеличивается при их создании.')
+    comments[0].delete()
+    assert _count(post) == 2
+    Comment.objects.filter(post=post).delete()
+    assert _count(post) == 0, (
+        'Убедитесь, что счётчик комментариев уменьшается при массовом '
+        'удалении.')
+
+
+def test_recount_comments_command(
+        mixer: Mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+    call_command('recount_comments', stdout=StringIO())
+    assert _count(post) == 2
+
+
+def test_feed_shows_stored_count(
+        mixer: Mixer, user_client, post_with_published_location):
+    mixer.cycle(2).blend('blog.Comment', post=post_with_published_location)
+    response = user_client.get('/')
+    assert 'Комментарии (2)' in response.content.decode()
@@ -0,0 +1,52 @@
+import pytest
+from mixer.backend.django import Mixer
+
+from blog.constants import COMMENTS_PER_PAGE
+from blog.models import Comment
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def many_comments(mixer: Mixer, post_with_published_location):
+    return mixer.cycle(COMMENTS_PER_PAGE * 2 + 5).blend(
+        'blog.Comment', post=post_with_published_location)
+
+
+def test_detail_shows_first_page_of_comments(
+        user_client, post_with_published_location, many_comments):
+    response = user_client.get(f'/posts/{post_with_published_location.pk}/')
+    comments = list(response.context['comments'])
+    assert len(comments) == COMMENTS_PER_PAGE, (
+        'Убедитесь, что на странице публикации показывается только первая '
+        'страница комментариев.'
+    )
+    expected = list(Comment.objects.filter(
+        post=post_with_published_location).order_by('created_at', 'pk'))
+    assert comments == expected[:COMMENTS_PER_PAGE]
+    assert 'Показать ещё комментарии' in response.content.decode()
+
+
+def test_comment_batches_endpoint(
+        user_client, post_with_published_location, many_comments):
+    url = f'/posts/{post_with_published_location.pk}/comments/'
+    seen, cursor = [], None
+    while True:
+        params = {'format': 'json'}
+        if cursor:
+            params['cursor'] = cursor
+        data = user_client.get(url, params).json()
+        seen.extend(item['id'] for item in data['comments'])
+        cursor = data['next_cursor']
+        if not cursor:
+            break
+    expected = list(Comment.objects.filter(
+        post=post_with_published_location).order_by(
+            'created_at', 'pk').values_list('pk', flat=True))
+    assert seen == expected
+
+    fragment = user_client.get(url).content.decode()
+    assert '<html' not in fragment
+    assert fragment.count('name="comment_') == COMMENTS_PER_PAGE
@@ -0,0 +1,102 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def _urls(post):
+    return (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+        f'/posts/{post.pk}/',
+    )
+
+
+def test_not_modified_without_rendering(
+        user_client, post_with_published_location):
+    for url in _urls(post_with_published_location):
+        etag = user_client.get(url)['ETag']
+        with CaptureQueriesContext(connection) as ctx:
+            response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            f'Убедитесь, что страница {url} отвечает 304 Not Modified '
+            'на запрос с актуальным ETag.'
+        )
+        blog_queries = [
+            query for query in ctx.captured_queries
+            if 'blog_' in query['sql']
+        ]
+        assert len(blog_queries) == 1, (
+            f'Убедитесь, что проверка ETag страницы {url} стоит '
+            'не больше одного запроса.'
+        )
+        assert 'COUNT(' not in blog_queries[0]['sql'], (
+            f'Убедитесь, что ETag страницы {url} считается по индексу, '
+            'без COUNT.'
+        )
+
+
+def test_post_detail_reads_post_once(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as ctx:
+        assert user_client.get(f'/posts/{post.pk}/').status_code == 200
+    post_reads = [
+        query for query in ctx.captured_queries
+        if query['sql'].startswith('SELECT')
+        and f'WHERE "blog_post"."id" = {post.pk}' in query['sql']
+    ]
+    assert len(post_reads) == 1, (
+        'Убедитесь, что публикация, загруженная для ETag, не читается '
+        'из базы повторно.'
+    )
+
+
+def test_etag_changes_on_content_change(
+        mixer: Mixer, user_client, post_with_published_location):
+    post = post_with_published_location
+    etags = {url: user_client.get(url)['ETag'] for url in _urls(post)}
+    mixer.blend('blog.Comment', post=post)
+    for url, etag in etags.items():
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            f'Убедитесь, что после нового комментария страница {url} '
+            'отдаётся заново.'
+        )
+
+
+def test_etag_depends_on_user(
+        user_client, another_user_client, post_with_published_location):
+    etag = user_client.get('/')['ETag']
+    response = another_user_client.get('/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('change', ['delete', 'unpublish_category'])
+def test_etag_changes_when_older_post_disappears(
+        mixer: Mixer, user_client, user, published_category, change):
+    older, newer = mixer.cycle(2).blend(
+        'blog.Post', author=user, category=published_category)
+    newer.save()
+    urls = (
+        ('/', f'/category/{published_category.slug}/',
+         f'/profile/{user.username}/')
+        if change == 'delete' else ('/',)
+    )
+    etags = {url: user_client.get(url)['ETag'] for url in urls}
+    if change == 'delete':
+        older.delete()
+    else:
+        published_category.is_published = False
+        published_category.save()
+    for url, etag in etags.items():
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            f'Убедитесь, что страница {url} отдаётся заново после удаления '
+            'публикации или снятия категории с публикации.'
+        )
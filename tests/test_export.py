@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+from django.core.management import call_command
+from django.http import StreamingHttpResponse
+from mixer.backend.django import Mixer
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+EXPORT_URL = '/export/'
+
+
+@pytest.fixture
+def corpus(mixer: Mixer, user, another_user, published_category):
+    old = mixer.cycle(2).blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=datetime(2020, 1, 1, tzinfo=timezone.utc))
+    new = mixer.cycle(3).blend(
+        'blog.Post', author=another_user,
+        pub_date=datetime(2023, 6, 1, tzinfo=timezone.utc))
+    mixer.cycle(4).blend('blog.Comment', post=old[0], author=user)
+    return old, new
+
+
+@pytest.fixture
+def staff_client(client, user):
+    user.is_staff = True
+    user.save()
+    client.force_login(user)
+    return client
+
+
+def test_export_command_jsonl_with_filters(corpus, user):
+    old, _ = corpus
+    out = io.StringIO()
+    call_command('export_blog', 'posts', '--author', user.username,
+                 '--until', '2021-01-01', '--chunk-size', '1', stdout=out)
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [row['id'] for row in rows] == [post.pk for post in old], (
+        'Убедитесь, что export_blog выгружает публикации с учётом фильтров '
+        'по автору и датам.'
+    )
+    assert rows[0]['author__username'] == user.username
+
+
+def test_export_endpoint_streams_csv(staff_client, corpus,
+                                     published_category):
+    response = staff_client.get(EXPORT_URL, {
+        'kind': 'comments', 'format': 'csv',
+        'category': published_category.slug})
+    assert response.status_code == 200
+    assert isinstance(response, StreamingHttpResponse), (
+        'Убедитесь, что выгрузка отдаётся через StreamingHttpResponse.'
+    )
+    content = b''.join(response.streaming_content).decode()
+    rows = list(csv.DictReader(io.StringIO(content)))
+    assert len(rows) == 4
+    assert rows[0]['post_id'] == str(corpus[0][0].pk)
+
+
+def test_export_endpoint_is_staff_only(user_client, client):
+    assert user_client.get(EXPORT_URL).status_code == 403, (
+        'Убедитесь, что выгрузка недоступна пользователям без is_staff.'
+    )
+    assert client.get(EXPORT_URL).status_code == 302
+
+
+def test_export_endpoint_rejects_bad_filters(staff_client):
+    assert staff_client.get(
+        EXPORT_URL, {'since': 'вчера'}).status_code == 400
+    assert staff_client.get(
+        EXPORT_URL, {'format': 'xml'}).status_code == 400
@@ -0,0 +1,50 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def _feed_urls(user, category):
+    return (
+        '/',
+        f'/category/{category.slug}/',
+        f'/profile/{user.username}/',
+    )
+
+
+def _n_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(ctx.captured_queries)
+
+
+def test_feed_query_count_does_not_depend_on_posts(
+        mixer: Mixer, user, user_client, published_category,
+        published_locations, django_capture_on_commit_callbacks):
+    # Копии картинок строятся после фиксации транзакции, а не при показе.
+    with django_capture_on_commit_callbacks(execute=True):
+        mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            location=published_locations[0], is_published=True)
+    baseline = {
+        url: _n_queries(user_client, url)
+        for url in _feed_urls(user, published_category)
+    }
+
+    with django_capture_on_commit_callbacks(execute=True):
+        mixer.cycle(N_PER_PAGE * 2).blend(
+            'blog.Post', author=user, category=published_category,
+            location=mixer.sequence(*published_locations),
+            is_published=True)
+    for url in _feed_urls(user, published_category):
+        assert _n_queries(user_client, url) == baseline[url], (
+            f'Убедитесь, что число запросов к БД на странице {url} '
+            'не зависит от количества публикаций на ней.'
+        )
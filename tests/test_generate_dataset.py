@@ -0,0 +1,83 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count, F
+from django.utils import timezone
+
+from blog.models import Comment, Post, User
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def _generate(prefix, seed=7):
+    out = io.StringIO()
+    call_command(
+        'generate_dataset', '--users', '20', '--categories', '3',
+        '--locations', '4', '--posts', '200', '--comments', '1500',
+        '--future-share', '0.1', '--unpublished-share', '0.1',
+        '--batch-size', '64', '--chunk-size', '500',
+        '--seed', str(seed), '--prefix', prefix, stdout=out)
+    return out.getvalue()
+
+
+def _snapshot(prefix):
+    posts = Post.objects.filter(author__username__startswith=prefix)
+    comments = Comment.objects.filter(post__in=posts).order_by('pk')
+    first_post = posts.order_by('pk').first().pk
+    return (
+        list(posts.order_by('pk').values_list('title', 'is_published')),
+        [(post_id - first_post, text)
+         for post_id, text in comments.values_list('post_id', 'text')],
+    )
+
+
+def test_generate_dataset_shapes_and_recounts():
+    output = _generate('a')
+    assert 'строк/с' in output
+    assert Comment.objects.count() == 1500
+    posts_per_author = list(
+        User.objects.annotate(n=Count('posts'))
+        .order_by('-n').values_list('n', flat=True))
+    median = posts_per_author[len(posts_per_author) // 2]
+    assert posts_per_author[0] > 5 * median, (
+        'Убедитесь, что число публикаций на автора распределено по Ципфу.'
+    )
+    assert Post.objects.filter(pub_date__gt=timezone.now()).exists()
+    assert Post.objects.filter(is_published=False).exists(), (
+        'Убедитесь, что генератор создаёт отложенные и снятые публикации.'
+    )
+    top = Post.objects.order_by('-comment_count').first()
+    assert top.comment_count == top.comments.count() > 1500 / 200, (
+        'Убедитесь, что comment_count пересчитан, а у популярных публикаций '
+        'комментариев заметно больше среднего.'
+    )
+
+
+def test_generated_comments_follow_their_posts():
+    _generate('a')
+    assert not Comment.objects.filter(
+        created_at__lt=F('post__pub_date')).exists(), (
+        'Убедитесь, что комментарий создан не раньше публикации.'
+    )
+    assert not Comment.objects.filter(
+        created_at__gt=timezone.now()).exists(), (
+        'Убедитесь, что генератор не создаёт комментарии из будущего, в '
+        'том числе к отложенным публикациям.'
+    )
+    assert Comment.objects.dates('created_at', 'day').count() > 1, (
+        'Убедитесь, что created_at комментариев задан явно, а не временем '
+        'загрузки.'
+    )
+
+
+def test_generate_dataset_is_reproducible_from_seed():
+    _generate('a')
+    _generate('b')
+    _generate('c', seed=8)
+    assert _snapshot('a') == _snapshot('b'), (
+        'Убедитесь, что один и тот же seed даёт одинаковый набор данных.'
+    )
+    assert _snapshot('a') != _snapshot('c')
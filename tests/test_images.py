@@ -0,0 +1,144 @@
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import override_settings
+from mixer.backend.django import Mixer
+from PIL import Image
+
+from blog.constants import IMAGE_VARIANT_FORMATS, IMAGE_VARIANT_WIDTHS
+from blog.images import get_variants, variant_backlog, variant_name
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def media_root(tmp_path):
+    cache.clear()
+    with override_settings(MEDIA_ROOT=tmp_path):
+        yield tmp_path
+    cache.clear()
+
+
+def _jpeg(size, color):
+    data = BytesIO()
+    Image.new('RGB', size, color).save(data, 'JPEG')
+    return data.getvalue()
+
+
+@pytest.fixture
+def post_with_big_image(mixer: Mixer, media_root, user, published_category,
+                        django_capture_on_commit_callbacks):
+    post = mixer.blend('blog.Post', author=user, category=published_category,
+                       image=None)
+    with django_capture_on_commit_callbacks(execute=True):
+        post.image.save('big.jpg', ContentFile(_jpeg((1200, 800), 'teal')))
+    return post
+
+
+def _expected_names(post):
+    return [
+        variant_name(post.image.name, width, image_format)
+        for width in IMAGE_VARIANT_WIDTHS
+        for image_format in IMAGE_VARIANT_FORMATS
+    ]
+
+
+def test_variants_created_on_save(post_with_big_image):
+    storage = post_with_big_image.image.storage
+    for name in _expected_names(post_with_big_image):
+        assert storage.exists(name), (
+            'Убедитесь, что при сохранении публикации создаются '
+            'уменьшенные копии картинки.'
+        )
+    with storage.open(_expected_names(post_with_big_image)[0]) as fh:
+        assert Image.open(fh).size == (IMAGE_VARIANT_WIDTHS[0], 213)
+
+
+def test_variants_built_after_commit(
+        mixer: Mixer, media_root, user, published_category,
+        django_capture_on_commit_callbacks):
+    post = mixer.blend('blog.Post', author=user, category=published_category,
+                       image=None)
+    with django_capture_on_commit_callbacks() as callbacks:
+        post.image.save('late.jpg', ContentFile(_jpeg((1200, 800), 'red')))
+        names = _expected_names(post)
+        assert not any(post.image.storage.exists(name) for name in names), (
+            'Убедитесь, что копии картинки создаются после фиксации '
+            'транзакции, а не внутри неё.'
+        )
+    assert len(callbacks) == 1
+    callbacks[0]()
+    assert all(post.image.storage.exists(name) for name in names)
+
+
+def test_responsive_image_tag(post_with_big_image):
+    html = Template(
+        '{% load blog_images %}{% responsive_image post.image "card" %}'
+    ).render(Context({'post': post_with_big_image}))
+    assert 'loading="lazy"' in html
+    assert 'type="image/webp"' in html
+    assert f'{IMAGE_VARIANT_WIDTHS[0]}w' in html
+    assert 'sizes="' in html
+    assert html.count('<img') == 1
+
+
+def test_backfill_command(post_with_big_image):
+    storage = post_with_big_image.image.storage
+    for name in _expected_names(post_with_big_image):
+        storage.delete(name)
+    call_command('build_image_variants', processes=1, stdout=StringIO())
+    assert all(
+        storage.exists(name)
+        for name in _expected_names(post_with_big_image))
+
+
+def test_unreadable_image_failure_is_cached(mixer: Mixer, media_root, user,
+                                            published_category, monkeypatch):
+    post = mixer.blend('blog.Post', author=user, category=published_category,
+                       image=None)
+    post.image.save('broken.jpg', ContentFile(b'not an image'))
+    cache.clear()
+    opened = []
+    storage = post.image.storage
+    original_open = storage.open
+
+    def counting_open(name, mode='rb'):
+        opened.append(name)
+        return original_open(name, mode)
+
+    monkeypatch.setattr(storage, 'open', counting_open)
+    for _ in range(3):
+        assert get_variants(post.image) == (None, [])
+    assert len(opened) == 1, (
+        'Убедитесь, что неудачная попытка открыть картинку кэшируется и не '
+        'повторяется при каждой отрисовке.'
+    )
+
+
+def test_variant_backlog_follows_pending_images(
+        post_with_big_image, mixer: Mixer, settings):
+    post = post_with_big_image
+    assert variant_backlog() == 0, (
+        'Убедитесь, что публикация выходит из очереди, когда копии готовы.'
+    )
+    settings.BLOG_IMAGE_VARIANTS_ON_SAVE = False
+    post.image.save('replaced.jpg', ContentFile(_jpeg((800, 600), 'navy')))
+    broken = mixer.blend('blog.Post', author=post.author,
+                         category=post.category, image=None)
+    broken.image.save('broken.jpg', ContentFile(b'not an image'))
+    post.title = 'Без новой картинки'
+    post.save()
+    assert variant_backlog() == 2, (
+        'Убедитесь, что новая картинка публикации попадает в очередь на '
+        'уменьшенные копии.'
+    )
+    out = StringIO()
+    call_command('build_image_variants', processes=1, stdout=out)
+    assert 'без копий: 1' in out.getvalue()
+    assert variant_backlog() == 1
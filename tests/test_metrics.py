@@ -0,0 +1,129 @@
+import json
+import subprocess
+import sys
+import threading
+
+import pytest
+from django.test import Client
+
+from blog.metrics import ARCHIVE, MetricsRegistry, collect, render
+from blog.outbox import enqueue_email
+
+METRICS_URL = '/metrics'
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr('blog.metrics.registry', registry)
+    monkeypatch.setattr('blog.middleware.registry', registry)
+    return registry
+
+
+@pytest.fixture
+def metrics_settings(settings, tmp_path):
+    settings.BLOG_METRICS = True
+    settings.BLOG_METRICS_DIR = str(tmp_path)
+    return settings
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint(metrics_settings, registry, published_category,
+                          mixer, user):
+    client = Client()
+    client.get('/')
+    client.get(f'/category/{published_category.slug}/')
+    client.get('/')
+    enqueue_email('Тема', 'Текст', 'from@example.com', ['to@example.com'])
+    response = client.get(METRICS_URL)
+    assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+    text = response.content.decode()
+    assert ('blog_requests_total{view="blog:index",method="GET",'
+            'status="200"} 2') in text, (
+        'Убедитесь, что /metrics считает запросы по имени view.'
+    )
+    assert ('blog_request_duration_seconds_count'
+            '{view="blog:category_posts"} 1') in text
+    assert 'blog_request_duration_seconds_bucket{view="blog:index",' \
+           'le="+Inf"} 2' in text
+    assert 'blog_db_queries_total{view="blog:index"}' in text
+    assert 'blog_cache_misses_total{cache="page"}' in text, (
+        'Убедитесь, что /metrics показывает попадания и промахи кэшей.'
+    )
+    assert 'blog_outbox_pending 1' in text
+    assert 'blog_image_variant_backlog 0' in text
+    metrics_settings.BLOG_IMAGE_VARIANTS_ON_SAVE = False
+    mixer.blend('blog.Post', author=user, category=published_category,
+                image='media/pending.jpg')
+    assert 'blog_image_variant_backlog 1' in client.get(
+        METRICS_URL).content.decode(), (
+        'Убедитесь, что /metrics считает публикации с картинками без копий.'
+    )
+
+
+def test_metrics_aggregate_worker_snapshots(tmp_path, registry):
+    worker = MetricsRegistry()
+    worker.inc('blog_requests_total', (('view', 'blog:index'),), 3)
+    worker.observe('blog_request_duration_seconds', 0.02,
+                   (('view', 'blog:index'),))
+    (tmp_path / '1.json').write_text('{"counters": [')
+    (tmp_path / '4242.json').write_text(json.dumps(worker.snapshot()))
+    registry.inc('blog_requests_total', (('view', 'blog:index'),), 2)
+    registry.observe('blog_request_duration_seconds', 7,
+                     (('view', 'blog:index'),))
+    text = render(*collect(tmp_path), {})
+    assert 'blog_requests_total{view="blog:index"} 5' in text, (
+        'Убедитесь, что метрики процессов суммируются через общий каталог.'
+    )
+    assert ('blog_request_duration_seconds_bucket'
+            '{view="blog:index",le="0.025"} 1') in text
+    assert ('blog_request_duration_seconds_bucket'
+            '{view="blog:index",le="10"} 2') in text
+    assert 'blog_request_duration_seconds_sum{view="blog:index"} 7.02' in text
+
+
+def test_dead_process_snapshots_are_archived(tmp_path, registry):
+    finished = subprocess.Popen([sys.executable, '-c', ''])
+    finished.wait()
+    dead_pid = finished.pid
+    worker = MetricsRegistry()
+    worker.inc('blog_requests_total', (('view', 'blog:index'),), 3)
+    for token in ('a', 'b'):
+        (tmp_path / f'{dead_pid}-{token}.json').write_text(
+            json.dumps(worker.snapshot()))
+    registry.inc('blog_requests_total', (('view', 'blog:index'),), 1)
+    registry.dump(tmp_path)
+    registry.dump(tmp_path)
+    assert sorted(path.name for path in tmp_path.glob('*.json')) == sorted(
+        [ARCHIVE, registry.filename]), (
+        'Убедитесь, что снимки завершившихся процессов переносятся в архив.'
+    )
+    counters, _ = collect(tmp_path)
+    assert counters['blog_requests_total', (('view', 'blog:index'),)] == 7
+    assert MetricsRegistry().filename != registry.filename, (
+        'Убедитесь, что процесс с тем же PID не затирает чужой снимок.'
+    )
+
+
+def test_registry_is_thread_safe(registry):
+    def work():
+        for _ in range(2000):
+            registry.inc('blog_requests_total')
+            registry.observe('blog_request_duration_seconds', 0.1)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counters, histograms = collect(None)
+    assert counters['blog_requests_total', ()] == 16000
+    assert sum(
+        histograms['blog_request_duration_seconds', ()]['counts']) == 16000
+
+
+def test_metrics_disabled_or_forbidden(client, settings):
+    assert client.get(METRICS_URL).status_code == 404
+    settings.BLOG_METRICS = True
+    settings.BLOG_METRICS_ALLOWED_IPS = []
+    assert client.get(METRICS_URL).status_code == 403
@@ -0,0 +1,58 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def _selects_from(client, method, url, table):
+    with CaptureQueriesContext(connection) as ctx:
+        getattr(client, method)(url)
+    return sum(
+        1 for query in ctx.captured_queries
+        if query['sql'].startswith('SELECT')
+        and f'FROM "{table}"' in query['sql']
+    )
+
+
+@pytest.mark.parametrize('suffix', ['edit/', 'delete/'])
+def test_post_is_fetched_once(user_client, post_with_published_location,
+                              suffix):
+    url = f'/posts/{post_with_published_location.pk}/{suffix}'
+    assert _selects_from(user_client, 'get', url, 'blog_post') == 1, (
+        'Убедитесь, что публикация загружается из БД один раз за запрос.')
+
+
+@pytest.mark.parametrize('action', ['edit_comment', 'delete_comment'])
+def test_comment_is_fetched_once(user_client, mixer, user,
+                                 post_with_published_location, action):
+    comment = mixer.blend('blog.Comment', author=user,
+                          post=post_with_published_location)
+    url = f'/posts/{comment.post_id}/{action}/{comment.pk}/'
+    assert _selects_from(user_client, 'get', url, 'blog_comment') == 1, (
+        'Убедитесь, что комментарий загружается из БД один раз за запрос.')
+
+
+def test_foreign_post_edit_redirects(another_user_client,
+                                     post_with_published_location):
+    url = f'/posts/{post_with_published_location.pk}/edit/'
+    response = another_user_client.get(url)
+    assert response.status_code == 302
+    assert response.url == f'/posts/{post_with_published_location.pk}/'
+
+
+def test_post_delete_signals_see_all_counted_fields(
+        user_client, post_with_published_location, monkeypatch):
+    seen = []
+    monkeypatch.setattr(
+        'blog.signals.bump_tag',
+        lambda kind, pk=None: seen.append((kind, pk)))
+    post = post_with_published_location
+    user_client.post(f'/posts/{post.pk}/delete/')
+    assert ('category-feed', post.category_id) in seen
+    assert ('author-feed', post.author_id) in seen, (
+        'Убедитесь, что при удалении публикации сигналы получают её '
+        'категорию и автора.'
+    )
@@ -0,0 +1,100 @@
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.forms import PostForm
+from blog.models import OutboxEmail, Post
+from blog.outbox import claim, enqueue_email, pending_emails, send_batch
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+class BrokenBackend:
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def open(self):
+        raise ConnectionError('SMTP недоступен')
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        self.open()
+
+
+def test_post_form_only_enqueues(user_client, published_category):
+    response = user_client.post('/posts/create/', {
+        'title': 'Заголовок',
+        'text': 'Текст',
+        'pub_date': timezone.now().strftime('%Y-%m-%dT%H:%M'),
+        'category': published_category.pk,
+    })
+    assert response.status_code == 302
+    assert len(mail.outbox) == 0, (
+        'Убедитесь, что форма публикации не отправляет письмо сама.')
+    assert OutboxEmail.objects.filter(sent_at__isnull=True).count() == 1
+
+    call_command('send_outbox', stdout=StringIO())
+    assert len(mail.outbox) == 1
+    assert not OutboxEmail.objects.filter(sent_at__isnull=True).exists()
+
+
+def test_invalid_post_form_enqueues_nothing(user_client):
+    user_client.post('/posts/create/', {'title': 'Без даты'})
+    assert not OutboxEmail.objects.exists()
+
+
+@override_settings(EMAIL_BACKEND='test_outbox.BrokenBackend')
+def test_failed_email_is_retried_with_backoff():
+    email = enqueue_email('Тема', 'Текст', 'from@blogicum.not',
+                          ['to@blogicum.not'])
+    assert send_batch(retry_delay=60) == (0, 1)
+    email.refresh_from_db()
+    assert email.attempts == 1
+    assert email.sent_at is None
+    assert 'SMTP недоступен' in email.last_error
+    assert email.next_attempt_at > timezone.now()
+    assert send_batch() == (0, 0), (
+        'Убедитесь, что письмо не отправляется повторно до истечения паузы.')
+
+
+def test_concurrent_workers_claim_each_email_once():
+    enqueue_email('Тема', 'Текст', 'from@blogicum.not', ['to@blogicum.not'])
+    first = list(pending_emails())
+    second = list(pending_emails())
+    assert len(claim(first)) == 1
+    assert claim(second) == [], (
+        'Убедитесь, что письмо, взятое одним обработчиком очереди, '
+        'не достаётся второму.'
+    )
+    assert send_batch() == (0, 0)
+
+
+def test_failed_post_save_enqueues_nothing(user, published_category,
+                                           monkeypatch):
+    def broken_enqueue(*args, **kwargs):
+        raise ConnectionError('очередь недоступна')
+
+    monkeypatch.setattr('blog.forms.enqueue_email', broken_enqueue)
+    form = PostForm(data={
+        'title': 'Заголовок',
+        'text': 'Текст',
+        'pub_date': timezone.now().strftime('%Y-%m-%dT%H:%M'),
+        'category': published_category.pk,
+    })
+    form.instance.author = user
+    assert form.is_valid()
+    with pytest.raises(ConnectionError):
+        form.save()
+    assert not Post.objects.exists(), (
+        'Убедитесь, что публикация и письмо о ней сохраняются в одной '
+        'транзакции.'
+    )
@@ -0,0 +1,153 @@
+import json
+import os
+import subprocess
+import sys
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.test.utils import override_settings
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.cache_backends import FileBasedCache
+from blog.models import Post
+from conftest import N_PER_PAGE
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+BUMP_TAG_SCRIPT = """
+import json, os, sys, django
+from django.conf import settings
+settings.configure(CACHES=json.loads(os.environ['BLOG_TEST_CACHES']))
+django.setup()
+from blog.cache_tags import bump_tag
+bump_tag(*sys.argv[1:])
+"""
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'blog.cache_backends.FileBasedCache',
+}
+
+
+@pytest.fixture(params=list(CACHE_BACKENDS))
+def cache_backend(request, tmp_path):
+    caches = {'default': {
+        'BACKEND': CACHE_BACKENDS[request.param],
+        'LOCATION': str(tmp_path),
+    }}
+    with override_settings(CACHES=caches):
+        cache.clear()
+        yield request.param
+
+
+@pytest.fixture
+def feed(mixer: Mixer, cache_backend, user, published_category,
+         published_location):
+    return mixer.cycle(N_PER_PAGE).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location, is_published=True)
+
+
+def _urls(post):
+    return (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+    )
+
+
+def test_anonymous_pages_are_cached(
+        client, feed, django_assert_max_num_queries):
+    for url in _urls(feed[0]):
+        first = client.get(url)
+        with django_assert_max_num_queries(1):
+            second = client.get(url)
+        assert second.status_code == 200
+        assert second.content == first.content, (
+            f'Убедитесь, что страница `{url}` для анонимного пользователя '
+            'отдаётся из кэша.'
+        )
+
+
+@pytest.mark.parametrize('change', ['post', 'author', 'category',
+                                    'location', 'comment', 'new_post'])
+def test_page_cache_invalidation(mixer: Mixer, client, feed, change):
+    post = feed[0]
+    for url in _urls(post):
+        client.get(url)
+    if change == 'post':
+        post.title = 'Новый заголовок'
+        post.save()
+        expected = 'Новый заголовок'
+    elif change == 'author':
+        post.author.first_name = 'Переименованный'
+        post.author.save()
+        expected = 'Переименованный'
+    elif change == 'category':
+        post.category.title = 'Новая категория'
+        post.category.save()
+        expected = 'Новая категория'
+    elif change == 'location':
+        post.location.name = 'Новое место'
+        post.location.save()
+        expected = 'Новое место'
+    elif change == 'comment':
+        mixer.blend('blog.Comment', post=post)
+        expected = 'Комментарии (1)'
+    else:
+        mixer.blend(
+            'blog.Post', title='Свежая публикация', author=post.author,
+            category=post.category, location=post.location,
+            is_published=True,
+            pub_date=timezone.now() - timedelta(minutes=2))
+        expected = 'Свежая публикация'
+    if change == 'author':
+        urls = _urls(post)[2:]
+    else:
+        urls = _urls(post)
+    for url in urls:
+        assert expected in client.get(url).content.decode(), (
+            f'Убедитесь, что кэш страницы `{url}` сбрасывается '
+            f'при изменении связанного объекта ({change}).'
+        )
+
+
+def test_tag_bumped_in_another_process(mixer: Mixer, client, user,
+                                       published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(hours=1))
+    client.get('/')
+    Post.objects.filter(pk=post.pk).update(title='Заголовок из другого места')
+    assert 'Заголовок из другого места' not in client.get('/').content.decode()
+    caches = {
+        alias: dict(config, LOCATION=str(config.get('LOCATION', '')))
+        for alias, config in settings.CACHES.items()
+    }
+    subprocess.run(
+        [sys.executable, '-c', BUMP_TAG_SCRIPT, 'post', str(post.pk)],
+        check=True, cwd=settings.BASE_DIR,
+        env=dict(os.environ, BLOG_TEST_CACHES=json.dumps(caches)))
+    assert 'Заголовок из другого места' in client.get('/').content.decode(), (
+        'Убедитесь, что кэш общий для процессов: тег, сброшенный командой '
+        'или другим воркером, сбрасывает и страницы этого процесса.'
+    )
+
+
+def test_file_cache_add_is_exclusive(tmp_path):
+    first = FileBasedCache(str(tmp_path), {})
+    second = FileBasedCache(str(tmp_path), {})
+    assert first.add('lock', 1, 60)
+    assert not second.add('lock', 2, 60), (
+        'Убедитесь, что add() файлового кэша не перезаписывает живой ключ '
+        'другого процесса.'
+    )
+    assert first.get('lock') == 1
+    assert second.add('expired', 1, -1)
+    assert second.add('expired', 2, 60)
+    assert first.get('expired') == 2
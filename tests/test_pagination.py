@@ -0,0 +1,113 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from blog.paginators import (
+    CachedCountPaginator, CursorPaginator, decode_cursor)
+from blog.models import Post
+from conftest import N_PER_PAGE
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def feed_posts(mixer: Mixer, user, published_category):
+    return mixer.cycle(N_PER_PAGE * 2 + 3).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True)
+
+
+def _walk(paginator, cursor_attr, start=None):
+    page = paginator.get_page(start)
+    pages = [page]
+    while getattr(page, cursor_attr):
+        page = paginator.get_page(getattr(page, cursor_attr))
+        pages.append(page)
+    return pages
+
+
+def test_cursor_paginator_walks_whole_feed(feed_posts):
+    paginator = CursorPaginator(Post.objects.all(), N_PER_PAGE)
+    pages = _walk(paginator, 'next_cursor')
+    seen = [post.pk for page in pages for post in page]
+    expected = list(
+        Post.objects.order_by('-pub_date', '-pk').values_list('pk', flat=True))
+    assert seen == expected, (
+        'Убедитесь, что курсорная пагинация проходит ленту без пропусков '
+        'и повторов.'
+    )
+    assert not pages[0].has_previous()
+    assert not pages[-1].has_next()
+
+    back = _walk(paginator, 'previous_cursor', pages[-1].previous_cursor)
+    assert [p.pk for p in back[0]] == [p.pk for p in pages[-2]]
+    assert [p.pk for p in back[-1]] == [p.pk for p in pages[0]]
+
+
+def test_cursor_is_opaque_and_tolerant(feed_posts):
+    paginator = CursorPaginator(Post.objects.all(), N_PER_PAGE)
+    first = paginator.get_page(None)
+    assert decode_cursor(first.next_cursor) is not None
+    assert decode_cursor('не-курсор') is None
+    assert [p.pk for p in paginator.get_page('мусор')] == [
+        p.pk for p in first]
+
+
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_cursor_mode_in_views(user, user_client, feed_posts,
+                              published_category):
+    for url in ('/', f'/category/{published_category.slug}/',
+                f'/profile/{user.username}/'):
+        response = user_client.get(url)
+        page_obj = response.context['page_obj']
+        assert len(page_obj) == N_PER_PAGE
+        assert f'?cursor={page_obj.next_cursor}' in response.content.decode()
+        next_page = user_client.get(
+            url, {'cursor': page_obj.next_cursor}).context['page_obj']
+        assert next_page[0].pub_date <= page_obj[len(page_obj) - 1].pub_date
+
+
+def _count(queryset):
+    with CaptureQueriesContext(connection) as ctx:
+        count = CachedCountPaginator(queryset, N_PER_PAGE).count
+    return count, len(ctx.captured_queries)
+
+
+def test_paginator_count_is_cached(feed_posts):
+    cache.clear()
+    feed = Post.objects.published().order_by('-pub_date')
+    assert _count(feed) == (len(feed_posts), 1)
+    assert _count(feed)[1] == 0, (
+        'Убедитесь, что число публикаций для одной и той же выборки '
+        'берётся из кэша.'
+    )
+    feed_posts[0].title = 'Новый заголовок'
+    feed_posts[0].save()
+    assert _count(feed)[1] == 0, (
+        'Убедитесь, что правка текста публикации не сбрасывает кэш счётчиков.'
+    )
+    feed_posts[0].is_published = False
+    feed_posts[0].save()
+    assert _count(feed)[0] == len(feed_posts) - 1, (
+        'Убедитесь, что снятие публикации сбрасывает кэш счётчиков.'
+    )
+    assert _count(feed.filter(pk__gt=0))[1] == 1
+
+
+def test_elided_page_range(mixer: Mixer, client, user, published_category):
+    mixer.cycle(N_PER_PAGE * 12).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, image=None)
+    content = client.get('/', {'page': 3}).content.decode()
+    assert '…' in content, (
+        'Убедитесь, что в пагинаторе длинной ленты пропущенные номера '
+        'страниц заменены многоточием.'
+    )
+    assert '?page=12"' in content
+    assert '?page=6"' in content
+    assert '?page=8"' not in content
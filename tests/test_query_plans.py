@@ -0,0 +1,44 @@
+import pytest
+from django.db import connection
+
+from blog.models import Post
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite',
+        reason='EXPLAIN QUERY PLAN есть только в SQLite'),
+]
+
+
+def _plan(queryset):
+    sql, params = queryset[:10].query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def _feed_querysets(user, category):
+    return {
+        'главная': Post.objects.published().for_feed(),
+        'категория': category.posts.published().for_feed(),
+        'профиль': user.posts.for_feed(),
+    }
+
+
+@pytest.mark.parametrize('ordering', [None, ('-pub_date', '-pk')])
+def test_feed_queries_use_indexes(user, published_category, ordering):
+    for page, queryset in _feed_querysets(user, published_category).items():
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        plan = _plan(queryset)
+        post_steps = [step for step in plan if 'blog_post' in step]
+        assert post_steps and all(
+            'USING' in step for step in post_steps), (
+            f'Убедитесь, что запрос ленты ({page}) не сканирует таблицу '
+            f'публикаций целиком: {plan}'
+        )
+        assert not any('TEMP B-TREE' in step for step in plan), (
+            f'Убедитесь, что запрос ленты ({page}) не сортирует '
+            f'результат во временном B-дереве: {plan}'
+        )
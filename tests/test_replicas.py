@@ -0,0 +1,107 @@
+import sqlite3
+import time
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.sessions.models import Session
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from mixer.backend.django import Mixer
+
+from blog.middleware import ReadReplicaMiddleware
+from blog.models import Post
+from blog.replicas import sync_replica
+from blog.routers import ReadReplicaRouter
+
+router = ReadReplicaRouter()
+User = get_user_model()
+
+
+def view(request):
+    if request.method == 'POST':
+        router.db_for_write(Post)
+    return HttpResponse(router.db_for_read(Post) or 'default')
+
+
+view.__module__ = 'blog.views'
+
+
+def _read_db(request):
+    def get_response(request):
+        middleware.process_view(request, view, (), {})
+        return view(request)
+
+    middleware = ReadReplicaMiddleware(get_response)
+    return middleware(request)
+
+
+@override_settings(BLOG_READ_REPLICAS=['replica'])
+def test_blog_get_views_read_from_replica():
+    factory = RequestFactory()
+    response = _read_db(factory.get('/'))
+    assert response.content == b'replica', (
+        'Убедитесь, что GET-запросы к представлениям blog.views читают '
+        'из реплики.'
+    )
+    assert router.db_for_read(Post) is None, (
+        'Убедитесь, что вне запроса чтение идёт из основной базы.'
+    )
+
+    response = _read_db(factory.post('/'))
+    assert response.content == b'default'
+    pin = response.cookies[ReadReplicaMiddleware.cookie_name]
+    assert int(pin.value) > time.time(), (
+        'Убедитесь, что после записи пользователь получает cookie, '
+        'закрепляющую чтение за основной базой.'
+    )
+
+    request = factory.get('/')
+    request.COOKIES[ReadReplicaMiddleware.cookie_name] = pin.value
+    assert _read_db(request).content == b'default', (
+        'Убедитесь, что сразу после записи пользователь читает '
+        'из основной базы и видит свои изменения.'
+    )
+
+
+def test_no_replicas_configured():
+    response = _read_db(RequestFactory().post('/'))
+    assert response.content == b'default'
+    assert not response.cookies
+
+
+@pytest.mark.django_db(transaction=True)
+def test_sync_replica(mixer: Mixer, tmp_path):
+    mixer.cycle(3).blend('blog.Post')
+    target = tmp_path / 'replica.sqlite3'
+    sync_replica(target)
+    mixer.blend('blog.Post')
+    replica = sqlite3.connect(target)
+    assert replica.execute('SELECT COUNT(*) FROM blog_post').fetchone() == (
+        3,), 'Убедитесь, что sync_replica копирует основную базу в реплику.'
+    replica.close()
+    sync_replica(target)
+    replica = sqlite3.connect(target)
+    assert replica.execute('SELECT COUNT(*) FROM blog_post').fetchone() == (4,)
+    replica.close()
+
+
+@override_settings(BLOG_READ_REPLICAS=['replica'])
+def test_users_and_sessions_read_from_primary():
+    def user_view(request):
+        return HttpResponse(' '.join(
+            router.db_for_read(model) or 'default'
+            for model in (User, Session, ContentType)))
+
+    user_view.__module__ = 'blog.views'
+
+    def get_response(request):
+        middleware.process_view(request, user_view, (), {})
+        return user_view(request)
+
+    middleware = ReadReplicaMiddleware(get_response)
+    response = middleware(RequestFactory().get('/'))
+    assert response.content == b'default default default', (
+        'Убедитесь, что пользователи, сессии и типы содержимого читаются '
+        'из основной базы даже в GET-запросах к blog.views.'
+    )
@@ -0,0 +1,49 @@
+import logging
+import re
+
+import pytest
+from django.test import Client
+
+from blog.timing import current_timings
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+SERVER_TIMING = re.compile(
+    r'db;dur=[\d.]+;desc="(\d+) SQL", tpl;dur=([\d.]+), total;dur=[\d.]+')
+
+
+def test_server_timing_header(settings, user_client,
+                              post_with_published_location, caplog):
+    settings.BLOG_REQUEST_TIMING = True
+    post = post_with_published_location
+    with caplog.at_level(logging.INFO, logger='blog.timing'):
+        response = user_client.get(f'/posts/{post.pk}/')
+    match = SERVER_TIMING.fullmatch(response.get('Server-Timing', ''))
+    assert match, (
+        'Убедитесь, что при BLOG_REQUEST_TIMING ответ содержит заголовок '
+        'Server-Timing с временем SQL, шаблонов и запроса целиком.'
+    )
+    assert int(match[1]) > 0 and float(match[2]) > 0
+    record = next(r for r in caplog.records if hasattr(r, 'total_ms'))
+    assert record.view == 'blog:post_detail', (
+        'Убедитесь, что строка лога blog.timing содержит имя view.'
+    )
+    assert record.queries == int(match[1])
+    assert current_timings() is None
+
+
+def test_slow_queries_logged(settings, published_category, caplog):
+    settings.BLOG_REQUEST_TIMING = True
+    settings.BLOG_SLOW_QUERY_MS = 0
+    with caplog.at_level(logging.WARNING, logger='blog.timing'):
+        Client().get(f'/category/{published_category.slug}/')
+    slow = [r for r in caplog.records if hasattr(r, 'sql')]
+    assert slow and all(r.view == 'blog:category_posts' for r in slow), (
+        'Убедитесь, что медленные запросы логируются с SQL и именем view.'
+    )
+
+
+def test_disabled_by_default(client):
+    assert 'Server-Timing' not in client.get('/')
@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.models import Post
+from blog.search import search_posts, search_terms
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def search_posts_fixture(mixer: Mixer, user, published_category):
+    def blend(title, text, **kwargs):
+        kwargs.setdefault('is_published', True)
+        return mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            title=title, text=text, **kwargs)
+
+    return {
+        'title': blend('Ёжики в тумане', 'Про лес.'),
+        'text': blend('Прогулка', 'Видели ежика и белку.'),
+        'other': blend('Рецепт пирога', 'Мука, яйца, сахар.'),
+        'hidden': blend('Ежик', 'Черновик', is_published=False),
+        'future': blend('Ежик', 'Позже',
+                        pub_date=timezone.now() + timedelta(days=1)),
+    }
+
+
+def test_search_terms_are_stemmed():
+    assert search_terms('Публикации ЁЖИКОВ') == ['публикаци', 'ежик']
+
+
+def test_search_ranks_title_first(search_posts_fixture):
+    found = list(search_posts(Post.objects.published(), 'ёжик'))
+    assert found == [search_posts_fixture['title'],
+                     search_posts_fixture['text']]
+
+
+def test_search_edits_are_indexed(search_posts_fixture):
+    post = search_posts_fixture['other']
+    post.title = 'Пирог с ежевикой'
+    post.save()
+    assert list(search_posts(Post.objects.all(), 'ежевика')) == [post]
+    post.delete()
+    assert not search_posts(Post.objects.all(), 'ежевика').exists()
+
+
+def test_search_view(client, search_posts_fixture):
+    response = client.get('/search/', {'q': 'ежики'})
+    assert response.status_code == 200
+    posts = list(response.context['page_obj'])
+    assert posts == [search_posts_fixture['title'],
+                     search_posts_fixture['text']], (
+        'Убедитесь, что поиск возвращает только опубликованные '
+        'публикации, отсортированные по релевантности.'
+    )
+    assert client.get('/search/').status_code == 200
@@ -0,0 +1,122 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+from django.conf import settings
+from django.db import connection
+
+from blog.sqlite import apply_pragmas
+
+N_READERS = 4
+N_WRITERS = 2
+READS_PER_THREAD = 200
+WRITES_PER_THREAD = 100
+ROLLBACK_JOURNAL = {'journal_mode': 'DELETE', 'synchronous': 'FULL',
+                    'busy_timeout': 0}
+
+
+@pytest.mark.django_db
+def test_pragmas_applied_to_connection():
+    with connection.cursor() as cursor:
+        for name in ('busy_timeout', 'cache_size'):
+            cursor.execute(f'PRAGMA {name}')
+            expected = settings.BLOG_SQLITE_PRAGMAS[name]
+            assert cursor.fetchone()[0] == expected, (
+                f'Убедитесь, что PRAGMA {name} из BLOG_SQLITE_PRAGMAS '
+                'выполняется на каждом соединении с SQLite.'
+            )
+
+
+def _stress(path, pragmas):
+    """Читатели и писатели выполняют заданное число операций с базой."""
+    setup = sqlite3.connect(path)
+    apply_pragmas(setup, pragmas)
+    setup.execute('CREATE TABLE post (id INTEGER PRIMARY KEY, title TEXT)')
+    setup.executemany('INSERT INTO post (title) VALUES (?)',
+                      [(f'post {i}',) for i in range(1000)])
+    setup.commit()
+    setup.close()
+
+    counters = {'reads': 0, 'writes': 0, 'locked': 0}
+    lock = threading.Lock()
+    start = threading.Barrier(N_READERS + N_WRITERS)
+
+    def count(name):
+        with lock:
+            counters[name] += 1
+
+    def reader():
+        conn = sqlite3.connect(path, timeout=0, check_same_thread=False)
+        apply_pragmas(conn, pragmas)
+        start.wait()
+        for _ in range(READS_PER_THREAD):
+            try:
+                conn.execute('SELECT COUNT(*), MAX(title) FROM post')
+                count('reads')
+            except sqlite3.OperationalError:
+                count('locked')
+        conn.close()
+
+    def writer(number):
+        conn = sqlite3.connect(path, timeout=0, check_same_thread=False)
+        apply_pragmas(conn, pragmas)
+        start.wait()
+        for i in range(WRITES_PER_THREAD):
+            try:
+                with conn:
+                    conn.execute(
+                        'UPDATE post SET title = title || ? WHERE id = ?',
+                        ('!', (number * WRITES_PER_THREAD + i) % 1000 + 1))
+                count('writes')
+            except sqlite3.OperationalError:
+                count('locked')
+        conn.close()
+
+    threads = [threading.Thread(target=reader) for _ in range(N_READERS)]
+    threads += [threading.Thread(target=writer, args=(number,))
+                for number in range(N_WRITERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counters
+
+
+def test_concurrent_reads_and_writes(tmp_path):
+    result = _stress(tmp_path / 'blog.sqlite3', settings.BLOG_SQLITE_PRAGMAS)
+    assert result == {
+        'reads': N_READERS * READS_PER_THREAD,
+        'writes': N_WRITERS * WRITES_PER_THREAD,
+        'locked': 0,
+    }, (
+        'Убедитесь, что с BLOG_SQLITE_PRAGMAS параллельные чтение и запись '
+        'не завершаются ошибкой «database is locked».'
+    )
+
+
+def test_pragmas_throughput(tmp_path, benchmark_only):
+    results = {}
+    for label, pragmas in (('без настроек', ROLLBACK_JOURNAL),
+                           ('BLOG_SQLITE_PRAGMAS',
+                            settings.BLOG_SQLITE_PRAGMAS)):
+        started = time.perf_counter()
+        result = _stress(tmp_path / f'{len(results)}.sqlite3', pragmas)
+        elapsed = time.perf_counter() - started
+        results[label] = result
+        print(
+            f'\nSQLite {label}: '
+            f'{result["reads"] / elapsed:.0f} чтений/с, '
+            f'{result["writes"] / elapsed:.0f} записей/с, '
+            f'ошибок «database is locked»: {result["locked"]}'
+        )
+    before, after = results.values()
+    assert after['locked'] == 0 < before['locked'], (
+        'Убедитесь, что без BLOG_SQLITE_PRAGMAS запросы падают с «database '
+        'is locked», а с ними — нет.'
+    )
+    assert (after['reads'] + after['writes']
+            > before['reads'] + before['writes']), (
+        'Убедитесь, что с BLOG_SQLITE_PRAGMAS успешно выполняется больше '
+        'операций.'
+    )
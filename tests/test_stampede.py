@@ -0,0 +1,134 @@
+import threading
+import time
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from blog.cache_tags import bump_tag, tag_key
+from blog.page_cache import cache_anonymous_page, tag_page
+from blog.stampede import get_or_rebuild
+
+N_THREADS = 8
+REBUILD_SECONDS = 0.2
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class SlowBuild:
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(REBUILD_SECONDS)
+        return self.value
+
+
+def run_concurrently(func):
+    barrier = threading.Barrier(N_THREADS)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(func())
+
+    threads = [threading.Thread(target=worker) for _ in range(N_THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_expired_entry_is_rebuilt_once():
+    cache.set('feed', {'value': 'old', 'expires': time.time() - 1,
+                       'delta': 0.0}, 60)
+    build = SlowBuild('new')
+    results = run_concurrently(lambda: get_or_rebuild('feed', build, 60))
+    assert build.calls == 1, (
+        'Убедитесь, что истёкшую запись пересобирает ровно один поток.'
+    )
+    assert sorted(results) == ['new'] + ['old'] * (N_THREADS - 1), (
+        'Убедитесь, что пока запись пересобирается, остальные потоки '
+        'получают прежнее значение.'
+    )
+
+
+def test_cold_miss_waits_for_single_build():
+    build = SlowBuild('new')
+    results = run_concurrently(lambda: get_or_rebuild('feed', build, 60))
+    assert build.calls == 1, (
+        'Убедитесь, что при пустом кэше значение собирает один поток, '
+        'а остальные дожидаются его.'
+    )
+    assert results == ['new'] * N_THREADS
+
+
+def test_early_refresh_before_expiry():
+    build = SlowBuild('new')
+    cache.set('feed', {'value': 'old', 'expires': time.time() + 1,
+                       'delta': 1e6}, 60)
+    assert get_or_rebuild('feed', build, 60) == 'new', (
+        'Убедитесь, что запись, которая пересобирается долго, обновляется '
+        'заранее, до истечения срока.'
+    )
+    assert get_or_rebuild('feed', build, 60, beta=0) == 'new'
+    assert build.calls == 1
+
+
+def test_invalidated_page_is_rebuilt_once():
+    renders = SlowBuild(None)
+
+    @cache_anonymous_page
+    def view(request):
+        renders()
+        tag_page(request, [], tag_key('feed'))
+        return HttpResponse(f'render {renders.calls}')
+
+    def get():
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        request.LANGUAGE_CODE = 'ru'
+        return view(request).content.decode()
+
+    assert get() == 'render 1'
+    bump_tag('feed')
+    results = run_concurrently(get)
+    assert renders.calls == 2, (
+        'Убедитесь, что после инвалидации страницу ленты пересобирает '
+        'ровно один запрос.'
+    )
+    assert results == ['render 2'] * N_THREADS, (
+        'Убедитесь, что инвалидированная страница не отдаётся, пока '
+        'собирается новая.'
+    )
+
+
+def test_uncacheable_rebuild_drops_old_entry():
+    gone = SlowBuild(None)
+    cache.set('feed', {'value': 'old', 'expires': time.time() + 60,
+                       'delta': 0.0}, 60)
+
+    def get():
+        return get_or_rebuild('feed', gone, 60, is_valid=lambda value: False)
+
+    results = run_concurrently(get)
+    assert 'old' not in results, (
+        'Убедитесь, что отвергнутая is_valid запись не отдаётся даже '
+        'потокам, которые ждут пересборки.'
+    )
+    assert cache.get('feed') is None, (
+        'Убедитесь, что запись удаляется, если пересборка вернула None.'
+    )
@@ -0,0 +1,148 @@
+import gzip
+import json
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+
+STATIC_URL = '/static/'
+BOOTSTRAP = 'css/bootstrap.min.css'
+
+
+@pytest.fixture
+def collected(settings, tmp_path):
+    settings.STATIC_ROOT = tmp_path
+    call_command('collectstatic', '--noinput', '-v', '0')
+    manifest = json.loads((tmp_path / 'staticfiles.json').read_text())
+    return tmp_path, manifest['paths']
+
+
+def _body(response):
+    return b''.join(response.streaming_content)
+
+
+def test_collectstatic_writes_hashed_and_compressed_files(collected):
+    root, paths = collected
+    hashed = paths[BOOTSTRAP]
+    assert hashed != BOOTSTRAP, (
+        'Убедитесь, что collectstatic добавляет хэш содержимого в имена '
+        'файлов через манифест.'
+    )
+    original = (root / hashed).read_bytes()
+    assert gzip.decompress((root / f'{hashed}.gz').read_bytes()) == original
+    assert not (root / f"{paths['img/logo.png']}.gz").exists(), (
+        'Убедитесь, что уже сжатые картинки не сжимаются повторно.'
+    )
+
+
+def test_middleware_serves_precompressed_file(collected):
+    root, paths = collected
+    client = Client()
+    response = client.get(STATIC_URL + paths[BOOTSTRAP],
+                          HTTP_ACCEPT_ENCODING='br;q=0, gzip')
+    assert response.status_code == 200
+    assert response['Content-Encoding'] == 'gzip', (
+        'Убедитесь, что middleware отдаёт сжатую копию по Accept-Encoding.'
+    )
+    assert response['Content-Type'] == 'text/css'
+    assert response['Vary'] == 'Accept-Encoding'
+    assert 'immutable' in response['Cache-Control']
+    assert gzip.decompress(_body(response)) == (
+        root / paths[BOOTSTRAP]).read_bytes()
+
+    plain = client.get(STATIC_URL + BOOTSTRAP,
+                       HTTP_ACCEPT_ENCODING='gzip;q=0')
+    assert not plain.has_header('Content-Encoding')
+    assert plain['Cache-Control'] == 'public, max-age=60', (
+        'Убедитесь, что файлы без хэша в имени не кэшируются надолго.'
+    )
+    not_modified = client.get(STATIC_URL + BOOTSTRAP,
+                              HTTP_IF_NONE_MATCH=plain['ETag'])
+    assert not_modified.status_code == 304
+
+
+def test_middleware_supports_range(collected):
+    root, paths = collected
+    url = STATIC_URL + paths['img/logo.png']
+    original = (root / paths['img/logo.png']).read_bytes()
+    client = Client()
+    response = client.get(url, HTTP_RANGE='bytes=10-19')
+    assert response.status_code == 206, (
+        'Убедитесь, что middleware отвечает на Range кодом 206.'
+    )
+    assert _body(response) == original[10:20]
+    assert response['Content-Range'] == f'bytes 10-19/{len(original)}'
+    assert _body(client.get(url, HTTP_RANGE='bytes=-5')) == original[-5:]
+    assert client.get(
+        url, HTTP_RANGE=f'bytes={len(original)}-').status_code == 416
+
+
+@pytest.mark.django_db
+def test_templates_use_hashed_names(collected):
+    _, paths = collected
+    content = Client().get('/').content.decode()
+    assert STATIC_URL + paths['img/logo.png'] in content, (
+        'Убедитесь, что после collectstatic шаблоны ссылаются на файлы с '
+        'хэшем в имени.'
+    )
+
+
+def test_immutable_follows_manifest_written_by_another_process(
+        settings, tmp_path):
+    settings.STATIC_ROOT = tmp_path
+    hashed = 'css/site.0123456789ab.css'
+    (tmp_path / 'css').mkdir()
+    (tmp_path / hashed).write_text('body {}')
+    client = Client()
+    url = STATIC_URL + hashed
+    assert 'immutable' not in client.get(url)['Cache-Control']
+    # Так манифест появляется, когда collectstatic запускают отдельно от
+    # работающего сервера.
+    (tmp_path / 'staticfiles.json').write_text(json.dumps(
+        {'version': '1.0', 'paths': {'css/site.css': hashed}}))
+    assert 'immutable' in client.get(url)['Cache-Control'], (
+        'Убедитесь, что middleware перечитывает манифест, когда его '
+        'переписал другой процесс.'
+    )
+    (tmp_path / 'staticfiles.json').write_text('{"version": "1.0", "pa')
+    assert 'immutable' in client.get(url)['Cache-Control'], (
+        'Убедитесь, что недописанный манифест не сбрасывает прочитанный.'
+    )
+
+
+@pytest.mark.parametrize('if_none_match, status', [
+    ('*', 304),
+    ('"other", {etag}', 304),
+    ('W/{etag}', 304),
+    ('"other"', 200),
+    ('{etag}x', 200),
+])
+def test_middleware_parses_if_none_match(collected, if_none_match, status):
+    url = STATIC_URL + BOOTSTRAP
+    client = Client()
+    etag = client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=0')['ETag']
+    header = if_none_match.format(etag=etag)
+    response = client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=0',
+                          HTTP_IF_NONE_MATCH=header)
+    assert response.status_code == status, (
+        'Убедитесь, что If-None-Match разбирается как список ETag.'
+    )
+
+
+def test_middleware_ignores_range_on_stale_if_range(collected):
+    root, paths = collected
+    url = STATIC_URL + paths['img/logo.png']
+    original = (root / paths['img/logo.png']).read_bytes()
+    client = Client()
+    full = client.get(url)
+    fresh = client.get(url, HTTP_RANGE='bytes=0-9',
+                       HTTP_IF_RANGE=full['ETag'])
+    assert fresh.status_code == 206
+    assert client.get(url, HTTP_RANGE='bytes=0-9',
+                      HTTP_IF_RANGE=full['Last-Modified']).status_code == 206
+    stale = client.get(url, HTTP_RANGE='bytes=0-9',
+                       HTTP_IF_RANGE='"outdated"')
+    assert stale.status_code == 200, (
+        'Убедитесь, что при несовпадающем If-Range файл отдаётся целиком.'
+    )
+    assert _body(stale) == original
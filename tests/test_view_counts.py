@@ -0,0 +1,79 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from blog.models import Post
+from blog.view_counts import ViewCounter
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def counter():
+    return ViewCounter(batch_size=2)
+
+
+def test_detail_page_counts_views(
+        user_client, post_with_published_location, monkeypatch):
+    post_views = ViewCounter()
+    monkeypatch.setattr('blog.views.post_views', post_views)
+    post = post_with_published_location
+    url = f'/posts/{post.pk}/'
+    user_client.get(url)
+    content = user_client.get(url).content.decode()
+    assert 'Просмотров: 2' in content, (
+        'Убедитесь, что страница публикации показывает число просмотров, '
+        'включая ещё не записанные в базу.'
+    )
+    assert Post.objects.get(pk=post.pk).views == 0, (
+        'Убедитесь, что просмотр не записывается в базу при каждом запросе.'
+    )
+    post_views.flush()
+    assert Post.objects.get(pk=post.pk).views == 2
+
+
+def test_flush_batches_updates(mixer: Mixer, counter):
+    posts = mixer.cycle(5).blend('blog.Post')
+    for n, post in enumerate(posts, start=1):
+        counter.increment(post.pk, n)
+    with CaptureQueriesContext(connection) as ctx:
+        assert counter.flush() == 15
+    assert len(ctx.captured_queries) == 3, (
+        'Убедитесь, что просмотры записываются пачками по batch_size '
+        'публикаций в одном UPDATE.'
+    )
+    assert 'CASE' in ctx.captured_queries[0]['sql']
+    assert [post.views for post in Post.objects.order_by('pk')] == [
+        1, 2, 3, 4, 5]
+    assert counter.flush() == 0
+
+
+def test_failed_flush_keeps_views(mixer: Mixer, counter, monkeypatch):
+    post = mixer.blend('blog.Post')
+    counter.increment(post.pk, 3)
+
+    def broken(batch):
+        raise RuntimeError('база недоступна')
+
+    monkeypatch.setattr(counter, '_write', broken)
+    with pytest.raises(RuntimeError):
+        counter.flush()
+    assert counter.pending(post.pk) == 3, (
+        'Убедитесь, что при ошибке записи просмотры остаются в буфере.'
+    )
+
+
+def test_not_modified_revisit_is_counted(
+        user_client, post_with_published_location, monkeypatch):
+    post_views = ViewCounter()
+    monkeypatch.setattr('blog.views.post_views', post_views)
+    url = f'/posts/{post_with_published_location.pk}/'
+    etag = user_client.get(url)['ETag']
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert post_views.pending(post_with_published_location.pk) == 2, (
+        'Убедитесь, что повторный просмотр с ответом 304 тоже засчитывается.'
+    )
@@ -0,0 +1,35 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.models import Post
+from blog.visibility import visibility_now
+
+
+@override_settings(BLOG_VISIBILITY_BUCKET=60)
+def test_visibility_now_is_bucketed():
+    now = visibility_now()
+    assert now.second == 0 and now.microsecond == 0
+    assert timezone.now() - now < timedelta(seconds=60)
+
+
+@pytest.mark.django_db
+@override_settings(BLOG_VISIBILITY_BUCKET=60)
+def test_deferred_post_appears_after_its_pub_date(
+        mixer: Mixer, user, another_user_client, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(days=1))
+    assert not Post.objects.published().filter(pk=post.pk).exists()
+    assert another_user_client.get(f'/posts/{post.pk}/').status_code == 404
+
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(seconds=61))
+    assert Post.objects.published().filter(pk=post.pk).exists(), (
+        'Убедитесь, что отложенная публикация появляется в ленте '
+        'без перезапуска сервера.'
+    )
+    assert another_user_client.get(f'/posts/{post.pk}/').status_code == 200